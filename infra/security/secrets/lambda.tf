@@ -53,6 +53,15 @@ resource "aws_iam_role_policy" "rotation_lambda" {
           aws_secretsmanager_secret.api_keys.arn
         ]
       },
+      {
+        # ListSecrets does not support resource-level permissions
+        Sid    = "SecretsManagerList"
+        Effect = "Allow"
+        Action = [
+          "secretsmanager:ListSecrets"
+        ]
+        Resource = "*"
+      },
       {
         Sid    = "KMSAccess"
         Effect = "Allow"
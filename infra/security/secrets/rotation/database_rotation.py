@@ -9,16 +9,117 @@ import json
 import logging
 import secrets
 import string
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 import boto3
 import psycopg2
 from psycopg2 import sql
 from botocore.exceptions import ClientError
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Password alphabet, built once per container rather than per call
+PASSWORD_LOWERCASE = string.ascii_lowercase
+PASSWORD_UPPERCASE = string.ascii_uppercase
+PASSWORD_DIGITS = string.digits
+PASSWORD_SPECIAL = "!#$%&*()-_=+[]{}:?"
+PASSWORD_ALL_CHARS = PASSWORD_LOWERCASE + PASSWORD_UPPERCASE + PASSWORD_DIGITS + PASSWORD_SPECIAL
+
+# Two of each class are always included
+PASSWORD_REQUIRED_CLASSES = (
+    PASSWORD_LOWERCASE,
+    PASSWORD_LOWERCASE,
+    PASSWORD_UPPERCASE,
+    PASSWORD_UPPERCASE,
+    PASSWORD_DIGITS,
+    PASSWORD_DIGITS,
+    PASSWORD_SPECIAL,
+    PASSWORD_SPECIAL,
+)
+
+# TCP keepalives stop proxies (RDS Proxy, NLB) from dropping the connection
+# while it waits between statements, which would force a new TLS handshake
+DB_CONNECT_OPTIONS = {
+    'sslmode': 'require',
+    'connect_timeout': 10,
+    'keepalives': 1,
+    'keepalives_idle': 5,
+    'application_name': 'secret-rotator',
+}
+
+_ALTER_USER_TEMPLATE = sql.SQL("ALTER USER {} WITH PASSWORD %s")
+
+# Composed ALTER USER statements by username; warm containers rotate the same users
+_ALTER_USER_STATEMENTS: Dict[str, sql.Composed] = {}
+
+
+@dataclass
+class RotationContext:
+    """
+    Secret state shared by the rotation step handlers.
+
+    The describe_secret metadata is read once per invocation. The AWSCURRENT and
+    AWSPENDING values are fetched on first use and then reused, so each step
+    only pays for the Secrets Manager reads it actually needs.
+    """
+
+    client: Any
+    secret_arn: str
+    token: str
+    metadata: Dict[str, Any]
+    _current_value: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    _pending_value: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    _pending_loaded: bool = field(default=False, repr=False)
+
+    @property
+    def versions(self) -> Dict[str, List[str]]:
+        """Version id -> staging labels, from the describe_secret metadata."""
+        return self.metadata.get('VersionIdsToStages', {})
+
+    @property
+    def current_value(self) -> Dict[str, Any]:
+        """The AWSCURRENT secret value."""
+        if self._current_value is None:
+            secret = self.client.get_secret_value(
+                SecretId=self.secret_arn,
+                VersionStage='AWSCURRENT'
+            )
+            self._current_value = loads_secret(secret['SecretString'])
+        return self._current_value
+
+    @property
+    def pending_value(self) -> Optional[Dict[str, Any]]:
+        """The AWSPENDING value for this token, or None if it does not exist yet."""
+        if not self._pending_loaded:
+            try:
+                secret = self.client.get_secret_value(
+                    SecretId=self.secret_arn,
+                    VersionId=self.token,
+                    VersionStage='AWSPENDING'
+                )
+                self._pending_value = loads_secret(secret['SecretString'])
+            except ClientError as e:
+                if 'ResourceNotFoundException' not in str(e):
+                    raise
+                self._pending_value = None
+            self._pending_loaded = True
+        return self._pending_value
+
+    def require_pending_value(self) -> Dict[str, Any]:
+        """The AWSPENDING value, failing if createSecret has not stored it."""
+        pending_value = self.pending_value
+        if pending_value is None:
+            raise ValueError(f"No AWSPENDING version found for token {self.token}")
+        return pending_value
+
 
 def rotate_database_secret(
     secrets_client: Any,
@@ -68,46 +169,37 @@ def rotate_database_secret(
     if not handler:
         raise ValueError(f"Unknown rotation step: {step}")
 
-    return handler(secrets_client, secret_arn, token)
+    context = RotationContext(
+        client=secrets_client,
+        secret_arn=secret_arn,
+        token=token,
+        metadata=metadata
+    )
+    return handler(context)
 
 
-def create_secret(
-    client: Any,
-    secret_arn: str,
-    token: str
-) -> Dict[str, Any]:
+def create_secret(context: RotationContext) -> Dict[str, Any]:
     """
     Create a new secret version with generated credentials.
 
     This step generates new database credentials and stores them
     as a pending version in Secrets Manager.
     """
+    client, secret_arn, token = context.client, context.secret_arn, context.token
     logger.info(f"Creating new secret version for: {secret_arn}")
 
+    # Check if pending version already exists
+    if context.pending_value is not None:
+        logger.info("Pending version already exists, using existing")
+        return {'status': 'pending_exists'}
+
     # Get current secret value
     try:
-        current_secret = client.get_secret_value(
-            SecretId=secret_arn,
-            VersionStage='AWSCURRENT'
-        )
-        current_value = json.loads(current_secret['SecretString'])
+        current_value = context.current_value
     except ClientError as e:
         logger.error(f"Failed to get current secret: {e}")
         raise
 
-    # Check if pending version already exists
-    try:
-        client.get_secret_value(
-            SecretId=secret_arn,
-            VersionId=token,
-            VersionStage='AWSPENDING'
-        )
-        logger.info("Pending version already exists, using existing")
-        return {'status': 'pending_exists'}
-    except ClientError as e:
-        if 'ResourceNotFoundException' not in str(e):
-            raise
-
     # Generate new password
     new_password = generate_secure_password(32)
 
@@ -127,7 +219,7 @@ def create_secret(
     client.put_secret_value(
         SecretId=secret_arn,
         ClientRequestToken=token,
-        SecretString=json.dumps(new_value),
+        SecretString=dumps_secret(new_value),
         VersionStages=['AWSPENDING']
     )
 
@@ -135,46 +227,24 @@ def create_secret(
     return {'status': 'created', 'token': token}
 
 
-def set_secret(
-    client: Any,
-    secret_arn: str,
-    token: str
-) -> Dict[str, Any]:
+def set_secret(context: RotationContext) -> Dict[str, Any]:
     """
     Set the new credentials in the database.
 
     This step connects to the database using the master credentials
     and updates the application user's password.
     """
-    logger.info(f"Setting new secret in database for: {secret_arn}")
+    logger.info(f"Setting new secret in database for: {context.secret_arn}")
 
-    # Get pending secret value
-    pending_secret = client.get_secret_value(
-        SecretId=secret_arn,
-        VersionId=token,
-        VersionStage='AWSPENDING'
-    )
-    pending_value = json.loads(pending_secret['SecretString'])
+    pending_value = context.require_pending_value()
 
-    # Get current secret for connection
-    current_secret = client.get_secret_value(
-        SecretId=secret_arn,
-        VersionStage='AWSCURRENT'
-    )
-    current_value = json.loads(current_secret['SecretString'])
+    # Current secret for connection
+    current_value = context.current_value
 
     # Connect to database using current credentials
     conn = None
     try:
-        conn = psycopg2.connect(
-            host=current_value['host'],
-            port=current_value['port'],
-            database=current_value['dbname'],
-            user=current_value['username'],
-            password=current_value['password'],
-            sslmode='require',
-            connect_timeout=10
-        )
+        conn = connect_database(current_value)
         conn.autocommit = True
 
         with conn.cursor() as cursor:
@@ -183,12 +253,7 @@ def set_secret(
             new_password = pending_value['password']
 
             # Use safe parameter binding
-            cursor.execute(
-                sql.SQL("ALTER USER {} WITH PASSWORD %s").format(
-                    sql.Identifier(username)
-                ),
-                [new_password]
-            )
+            cursor.execute(alter_user_statement(username), [new_password])
 
             logger.info(f"Updated password for user: {username}")
 
@@ -202,52 +267,35 @@ def set_secret(
             conn.close()
 
 
-def test_secret(
-    client: Any,
-    secret_arn: str,
-    token: str
-) -> Dict[str, Any]:
+def test_secret(context: RotationContext) -> Dict[str, Any]:
     """
     Test that the new credentials work.
 
     This step verifies that the application can connect to the database
     using the new credentials before finalizing the rotation.
     """
-    logger.info(f"Testing new secret for: {secret_arn}")
+    logger.info(f"Testing new secret for: {context.secret_arn}")
 
-    # Get pending secret value
-    pending_secret = client.get_secret_value(
-        SecretId=secret_arn,
-        VersionId=token,
-        VersionStage='AWSPENDING'
-    )
-    pending_value = json.loads(pending_secret['SecretString'])
+    pending_value = context.require_pending_value()
 
     # Test connection with new credentials
     conn = None
     try:
-        conn = psycopg2.connect(
-            host=pending_value['host'],
-            port=pending_value['port'],
-            database=pending_value['dbname'],
-            user=pending_value['username'],
-            password=pending_value['password'],
-            sslmode='require',
-            connect_timeout=10
-        )
+        conn = connect_database(pending_value)
 
         with conn.cursor() as cursor:
-            # Verify we can execute queries
-            cursor.execute("SELECT 1")
+            # Verify we can execute queries and have the necessary permissions
+            # in a single round-trip
+            cursor.execute("""
+                SELECT 1, has_table_privilege(current_user, 'information_schema.tables', 'SELECT')
+            """)
             result = cursor.fetchone()
 
             if result[0] != 1:
                 raise Exception("Test query returned unexpected result")
 
-            # Verify we have necessary permissions
-            cursor.execute("""
-                SELECT has_table_privilege(current_user, 'information_schema.tables', 'SELECT')
-            """)
+            if not result[1]:
+                logger.warning("New credentials lack SELECT on information_schema.tables")
 
             logger.info("New credentials tested successfully")
 
@@ -261,30 +309,25 @@ def test_secret(
             conn.close()
 
 
-def finish_secret(
-    client: Any,
-    secret_arn: str,
-    token: str
-) -> Dict[str, Any]:
+def finish_secret(context: RotationContext) -> Dict[str, Any]:
     """
     Finalize the rotation by moving AWSPENDING to AWSCURRENT.
 
     This step completes the rotation by updating version stages
     and cleaning up the previous version.
     """
+    client, secret_arn, token = context.client, context.secret_arn, context.token
     logger.info(f"Finishing secret rotation for: {secret_arn}")
 
-    # Get current version
-    metadata = client.describe_secret(SecretId=secret_arn)
-    versions = metadata.get('VersionIdsToStages', {})
-
+    # Current version, from the metadata read at the start of this invocation
     current_version = None
-    for version_id, stages in versions.items():
+    for version_id, stages in context.versions.items():
         if 'AWSCURRENT' in stages and version_id != token:
             current_version = version_id
             break
 
-    # Move AWSPENDING to AWSCURRENT
+    # Move AWSPENDING to AWSCURRENT; Secrets Manager moves AWSPREVIOUS onto the
+    # version AWSCURRENT is removed from, which keeps the old one for rollback
     client.update_secret_version_stage(
         SecretId=secret_arn,
         VersionStage='AWSCURRENT',
@@ -302,17 +345,6 @@ def finish_secret(
     except ClientError:
         pass  # May already be removed
 
-    # Move old version to AWSPREVIOUS for rollback capability
-    if current_version:
-        try:
-            client.update_secret_version_stage(
-                SecretId=secret_arn,
-                VersionStage='AWSPREVIOUS',
-                MoveToVersionId=current_version
-            )
-        except ClientError:
-            pass  # Previous stage may not exist
-
     logger.info(f"Rotation completed. New version: {token}")
     return {'status': 'finished', 'new_version': token, 'previous_version': current_version}
 
@@ -327,33 +359,53 @@ def generate_secure_password(length: int = 32) -> str:
     Returns:
         Secure random password
     """
-    # Define character sets
-    lowercase = string.ascii_lowercase
-    uppercase = string.ascii_uppercase
-    digits = string.digits
-    special = "!#$%&*()-_=+[]{}:?"
-
-    # Ensure at least one of each type
-    password = [
-        secrets.choice(lowercase),
-        secrets.choice(lowercase),
-        secrets.choice(uppercase),
-        secrets.choice(uppercase),
-        secrets.choice(digits),
-        secrets.choice(digits),
-        secrets.choice(special),
-        secrets.choice(special),
-    ]
-
-    # Fill remaining length with random characters
-    all_chars = lowercase + uppercase + digits + special
-    password.extend(secrets.choice(all_chars) for _ in range(length - len(password)))
-
-    # Shuffle to randomize position of required characters
-    password_list = list(password)
-    secrets.SystemRandom().shuffle(password_list)
-
-    return ''.join(password_list)
+    required = PASSWORD_REQUIRED_CLASSES
+    fill = max(length - len(required), 0)
+    total = len(required) + fill
+
+    # One bounded draw per required char, per fill char and per shuffle swap,
+    # all taken from a single entropy read
+    shuffle_bounds = range(total, 1, -1)
+    draws = _random_below(
+        [len(chars) for chars in required] + [len(PASSWORD_ALL_CHARS)] * fill + list(shuffle_bounds)
+    )
+
+    # Ensure at least two of each type, fill the rest from the full alphabet
+    password = [chars[i] for chars, i in zip(required, draws)]
+    password.extend(PASSWORD_ALL_CHARS[i] for i in draws[len(required):total])
+
+    # Fisher-Yates shuffle to randomize position of required characters
+    for i, j in zip(range(total - 1, 0, -1), draws[total:]):
+        password[i], password[j] = password[j], password[i]
+
+    return ''.join(password)
+
+
+def _random_below(bounds: List[int]) -> List[int]:
+    """
+    Draw one uniform integer in [0, bound) for each bound.
+
+    Reads 16-bit values from a single secrets.token_bytes() call and rejects
+    values past the largest multiple of the bound, so there is no modulo bias.
+    The pool is topped up only in the rare case rejections exhaust it.
+    """
+    pool = secrets.token_bytes(4 * len(bounds))
+    pos = 0
+    result = []
+
+    for bound in bounds:
+        limit = 65536 - 65536 % bound
+        while True:
+            if pos + 2 > len(pool):
+                pool = secrets.token_bytes(2 * len(bounds))
+                pos = 0
+            value = pool[pos] | (pool[pos + 1] << 8)
+            pos += 2
+            if value < limit:
+                result.append(value % bound)
+                break
+
+    return result
 
 
 def validate_connection_params(secret_value: Dict[str, Any]) -> bool:
@@ -368,8 +420,62 @@ def validate_connection_params(secret_value: Dict[str, Any]) -> bool:
     """
     required_fields = ['host', 'port', 'dbname', 'username', 'password']
 
-    for field in required_fields:
-        if field not in secret_value or not secret_value[field]:
-            raise ValueError(f"Missing required field: {field}")
+    for field_name in required_fields:
+        if field_name not in secret_value or not secret_value[field_name]:
+            raise ValueError(f"Missing required field: {field_name}")
 
     return True
+
+
+def alter_user_statement(username: str) -> sql.Composed:
+    """
+    Get the ALTER USER ... WITH PASSWORD statement for a user.
+
+    The username is quoted as an identifier; the password stays a bound
+    parameter.
+
+    Args:
+        username: Database user to update
+
+    Returns:
+        Composed SQL statement
+    """
+    statement = _ALTER_USER_STATEMENTS.get(username)
+    if statement is None:
+        statement = _ALTER_USER_TEMPLATE.format(sql.Identifier(username))
+        _ALTER_USER_STATEMENTS[username] = statement
+    return statement
+
+
+def loads_secret(secret_string: str) -> Dict[str, Any]:
+    """Parse a SecretString payload (orjson when bundled, stdlib json otherwise)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(secret_string)
+    return json.loads(secret_string)
+
+
+def dumps_secret(secret_value: Dict[str, Any]) -> str:
+    """Serialize a secret value for put_secret_value."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(secret_value).decode()
+    return json.dumps(secret_value)
+
+
+def connect_database(secret_value: Dict[str, Any]) -> Any:
+    """
+    Open a PostgreSQL connection with the credentials in a secret value.
+
+    Args:
+        secret_value: Secret value dictionary
+
+    Returns:
+        psycopg2 connection
+    """
+    return psycopg2.connect(
+        host=secret_value['host'],
+        port=secret_value['port'],
+        database=secret_value['dbname'],
+        user=secret_value['username'],
+        password=secret_value['password'],
+        **DB_CONNECT_OPTIONS
+    )
@@ -5,27 +5,87 @@ Main entry point for AWS Secrets Manager rotation.
 Handles rotation for database, JWT, Redis, and API key secrets.
 """
 
+import importlib
 import json
 import logging
 import os
-from typing import Any, Dict, Optional
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-from database_rotation import rotate_database_secret
-from jwt_rotation import rotate_jwt_secret
-from api_key_rotation import rotate_api_key_secret
-from redis_rotation import rotate_redis_secret
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from notifications import send_notification, NotificationType
 
+# Rotation handler per SecretType tag, as (module, function). Modules are imported
+# on first use so an invocation only loads the driver (psycopg2, redis, ...) it needs.
+_HANDLER_MODULES = MappingProxyType({
+    'DatabaseCredentials': ('database_rotation', 'rotate_database_secret'),
+    'JWTSecret': ('jwt_rotation', 'rotate_jwt_secret'),
+    'RedisCredentials': ('redis_rotation', 'rotate_redis_secret'),
+    'APIKeys': ('api_key_rotation', 'rotate_api_key_secret'),
+})
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Initialize AWS clients
-secrets_client = boto3.client('secretsmanager')
-sns_client = boto3.client('sns')
+# Adaptive retries back off client-side under throttling; the pool covers the
+# concurrent health-check describes.
+_AWS_CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    max_pool_connections=50,
+    tcp_keepalive=True,
+)
+# One session so credentials are resolved, cached and refreshed once for both clients
+_SESSION = boto3.session.Session()
+secrets_client = _SESSION.client('secretsmanager', config=_AWS_CLIENT_CONFIG)
+sns_client = _SESSION.client('sns', config=_AWS_CLIENT_CONFIG)
+
+# Steps Secrets Manager invokes the rotation function with
+_VALID_STEPS = frozenset({'createSecret', 'setSecret', 'testSecret', 'finishSecret'})
+
+# Steps whose failure needs no rollback: a failed createSecret has not touched
+# the live credentials, and Secrets Manager retries it with the same token
+_NO_ROLLBACK_STEPS = frozenset({'createSecret'})
+
+# Upper bound on concurrent describe_secret calls during a health check
+HEALTH_CHECK_MAX_WORKERS = 20
+
+# list_secrets page size when a health check enumerates the tagged secrets itself
+LIST_SECRETS_PAGE_SIZE = 100
+
+# SNS PublishBatch accepts at most 10 entries; subjects are capped at 100 characters
+SNS_PUBLISH_BATCH_SIZE = 10
+SNS_SUBJECT_MAX_LENGTH = 100
+
+# describe_secret results reused across warm invocations: ARN -> (expires_at, metadata, secret type)
+DESCRIBE_CACHE_TTL_SECONDS = 60
+DESCRIBE_CACHE_MAX_SIZE = 256
+_describe_cache: Dict[str, Tuple[float, Dict[str, Any], str]] = {}
+
+# Parsed secret values by (ARN, version stage) -> (expires_at, value); process memory
+# only, never logged. The short TTL bounds staleness after a rotation finished by
+# another container or a manual put_secret_value.
+SECRET_VALUE_CACHE_TTL_SECONDS = 30
+SECRET_VALUE_CACHE_MAX_SIZE = 128
+_secret_value_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+
+# Rotation notifications are published in the background and flushed before the
+# handler returns; Lambda freezes the container afterwards, so nothing may be left queued.
+_NOTIFY_POOL = ThreadPoolExecutor(max_workers=2)
+_pending_notifications: List[Future] = []
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -42,7 +102,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Response indicating success or failure
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received event: %s", _dumps(event))
 
     # Handle health check from EventBridge
     if event.get('action') == 'health_check':
@@ -61,27 +122,24 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.error("Missing required parameters for rotation")
         raise ValueError("SecretId, ClientRequestToken, and Step are required")
 
+    if step not in _VALID_STEPS:
+        logger.error(f"Invalid rotation step: {step}")
+        raise ValueError(f"Invalid step: {step}")
+
     # Get secret metadata to determine rotation type
     try:
-        secret_metadata = secrets_client.describe_secret(SecretId=secret_arn)
+        secret_metadata, secret_type = _describe_cached(secret_arn)
         secret_name = secret_metadata['Name']
-        tags = {tag['Key']: tag['Value'] for tag in secret_metadata.get('Tags', [])}
-        secret_type = tags.get('SecretType', 'Unknown')
     except ClientError as e:
         logger.error(f"Failed to describe secret: {e}")
         raise
 
-    logger.info(f"Processing rotation step '{step}' for secret '{secret_name}' (type: {secret_type})")
+    logger.info(
+        "Processing rotation step '%s' for secret '%s' (type: %s)", step, secret_name, secret_type
+    )
 
     # Route to appropriate rotation handler based on secret type
-    rotation_handlers = {
-        'DatabaseCredentials': rotate_database_secret,
-        'JWTSecret': rotate_jwt_secret,
-        'RedisCredentials': rotate_redis_secret,
-        'APIKeys': rotate_api_key_secret,
-    }
-
-    handler = rotation_handlers.get(secret_type)
+    handler = _get_handler(secret_type)
     if not handler:
         logger.error(f"Unknown secret type: {secret_type}")
         raise ValueError(f"No rotation handler for secret type: {secret_type}")
@@ -97,27 +155,22 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         # Send notification on successful completion
         if step == 'finishSecret':
-            send_notification(
+            _describe_cache.pop(secret_arn, None)
+            invalidate_secret_cache(secret_arn)
+            _notify(
                 notification_type=NotificationType.ROTATION_SUCCESS,
                 secret_name=secret_name,
                 secret_type=secret_type,
                 message=f"Successfully rotated {secret_type} secret: {secret_name}"
             )
 
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'message': f'Successfully completed step {step}',
-                'secret': secret_name,
-                'type': secret_type
-            })
-        }
+        return _rotation_response(step, secret_name, secret_type)
 
     except Exception as e:
         logger.error(f"Rotation failed: {e}")
 
         # Send failure notification
-        send_notification(
+        _notify(
             notification_type=NotificationType.ROTATION_FAILURE,
             secret_name=secret_name,
             secret_type=secret_type,
@@ -125,12 +178,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
 
         # Attempt rollback
-        if step not in ['createSecret']:
+        if step not in _NO_ROLLBACK_STEPS:
             try:
                 rollback_rotation(secrets_client, secret_arn, token, secret_type)
             except Exception as rollback_error:
                 logger.error(f"Rollback also failed: {rollback_error}")
-                send_notification(
+                _notify(
                     notification_type=NotificationType.ROLLBACK_FAILURE,
                     secret_name=secret_name,
                     secret_type=secret_type,
@@ -139,71 +192,113 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         raise
 
+    finally:
+        _flush_notifications()
+
+
+@cache
+def _get_handler(secret_type: str) -> Optional[Callable[..., Any]]:
+    """Import and return the rotation function for a secret type, or None if unknown."""
+    target = _HANDLER_MODULES.get(secret_type)
+    if target is None:
+        return None
+    module_name, function_name = target
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _rotation_response(step: str, secret_name: str, secret_type: str) -> Dict[str, Any]:
+    """
+    Build the result of a rotation step.
+
+    Secrets Manager invokes rotation steps directly and never reads the body,
+    so unlike the health check and manual rotation responses this is a plain
+    dict rather than an API Gateway envelope with a JSON string body.
+    """
+    return {
+        'statusCode': 200,
+        'message': f'Successfully completed step {step}',
+        'secret': secret_name,
+        'type': secret_type
+    }
+
+
+def _notify(**kwargs: Any) -> None:
+    """Queue a send_notification call on the background notification pool."""
+    _pending_notifications.append(_NOTIFY_POOL.submit(send_notification, **kwargs))
+
+
+def _flush_notifications() -> None:
+    """
+    Wait for queued notifications to be delivered.
+
+    Delivery failures are logged rather than raised so a notification problem
+    never changes the outcome of the rotation step itself.
+    """
+    pending = _pending_notifications[:]
+    _pending_notifications.clear()
+    wait(pending)
+    for future in pending:
+        error = future.exception()
+        if error:
+            logger.error(f"Failed to send notification: {error}")
+
 
 def handle_health_check(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handle health check for secrets rotation system.
 
     Verifies that all secrets are properly configured and rotation
-    is functioning as expected.
+    is functioning as expected. Checks the ARNs in event['secrets'], or every
+    secret carrying a SecretType tag when the event does not list any.
     """
     logger.info("Running secrets rotation health check")
 
-    secrets_to_check = event.get('secrets', [])
-    results = []
-    issues = []
-
-    for secret_arn in secrets_to_check:
+    secrets_to_check = event.get('secrets')
+    if secrets_to_check is None:
+        # list_secrets already returns the rotation fields, so no describe calls
         try:
-            metadata = secrets_client.describe_secret(SecretId=secret_arn)
-            secret_name = metadata['Name']
-
-            # Check rotation configuration
-            rotation_enabled = metadata.get('RotationEnabled', False)
-            last_rotation = metadata.get('LastRotatedDate')
-            next_rotation = metadata.get('NextRotationDate')
-
-            # Check for pending rotation versions
-            versions = metadata.get('VersionIdsToStages', {})
-            pending_versions = [v for v, stages in versions.items() if 'AWSPENDING' in stages]
-
-            status = 'healthy'
-            if pending_versions:
-                status = 'pending_rotation'
-                issues.append(f"{secret_name}: Has pending rotation version")
-            elif not rotation_enabled:
-                status = 'rotation_disabled'
-                issues.append(f"{secret_name}: Rotation is disabled")
-
-            results.append({
-                'secret_name': secret_name,
-                'status': status,
-                'rotation_enabled': rotation_enabled,
-                'last_rotation': str(last_rotation) if last_rotation else None,
-                'next_rotation': str(next_rotation) if next_rotation else None
-            })
-
+            checked = [
+                _assess_secret(secret, secret.get('SecretVersionsToStages', {}))
+                for secret in _list_rotated_secrets()
+            ]
         except ClientError as e:
-            logger.error(f"Failed to check secret {secret_arn}: {e}")
-            issues.append(f"Failed to access secret: {secret_arn}")
-            results.append({
-                'secret_arn': secret_arn,
-                'status': 'error',
-                'error': str(e)
-            })
+            logger.error(f"Failed to list secrets: {e}")
+            return {
+                'statusCode': 200,
+                'body': _dumps({
+                    'status': 'error',
+                    'issues_count': 1,
+                    'results': [],
+                    'issues': ["Failed to list secrets"],
+                    'error': str(e)
+                })
+            }
+    elif secrets_to_check:
+        workers = min(HEALTH_CHECK_MAX_WORKERS, len(secrets_to_check))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_check_one, arn) for arn in secrets_to_check]
+            # Collected in submission order so the report lists secrets as requested
+            checked = [future.result() for future in futures]
+    else:
+        checked = []
+
+    results = []
+    issues = []
+    # (secret name or ARN, issue) pairs for the per-issue notifications
+    flagged = []
+    for result, issue in checked:
+        results.append(result)
+        if issue:
+            issues.append(issue)
+            flagged.append((result.get('secret_name') or result['secret_arn'], issue))
 
     # Send notification if there are issues
     if issues:
-        send_notification(
-            notification_type=NotificationType.HEALTH_CHECK_WARNING,
-            secret_name='Multiple',
-            secret_type='HealthCheck',
-            message=f"Health check found {len(issues)} issue(s): " + "; ".join(issues)
-        )
+        _publish_health_issues(flagged)
 
     return {
         'statusCode': 200,
-        'body': json.dumps({
+        'body': _dumps({
             'status': 'healthy' if not issues else 'issues_found',
             'issues_count': len(issues),
             'results': results,
@@ -212,6 +307,125 @@ def handle_health_check(event: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _publish_health_issues(flagged: List[Tuple[str, str]]) -> None:
+    """
+    Publish one SNS message per health-check issue, batched SNS_PUBLISH_BATCH_SIZE at a time.
+
+    Falls back to a single combined notification when no topic is configured.
+    """
+    topic_arn = os.environ.get('SNS_TOPIC_ARN')
+    if not topic_arn:
+        send_notification(
+            notification_type=NotificationType.HEALTH_CHECK_WARNING,
+            secret_name='Multiple',
+            secret_type='HealthCheck',
+            message=f"Health check found {len(flagged)} issue(s): "
+                    + "; ".join(issue for _, issue in flagged)
+        )
+        return
+
+    for start in range(0, len(flagged), SNS_PUBLISH_BATCH_SIZE):
+        chunk = flagged[start:start + SNS_PUBLISH_BATCH_SIZE]
+        # A failed batch is logged so the remaining batches are still published
+        try:
+            response = sns_client.publish_batch(
+                TopicArn=topic_arn,
+                PublishBatchRequestEntries=[
+                    {
+                        'Id': str(start + i),
+                        'Subject': f"Health issue: {secret_name}"[:SNS_SUBJECT_MAX_LENGTH],
+                        'Message': issue,
+                    }
+                    for i, (secret_name, issue) in enumerate(chunk)
+                ]
+            )
+        except ClientError as e:
+            logger.error(f"Failed to publish {len(chunk)} health issue(s): {e}")
+            continue
+        for failure in response.get('Failed', []):
+            logger.error(
+                f"Failed to publish health issue {failure['Id']}: {failure.get('Message')}"
+            )
+
+
+def _check_one(secret_arn: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Check the rotation health of a single secret.
+
+    Returns the result entry and the issue it raised, if any. ClientErrors are
+    reported as an 'error' result so one inaccessible secret does not abort
+    the rest of the health check.
+    """
+    try:
+        metadata = secrets_client.describe_secret(SecretId=secret_arn)
+    except ClientError as e:
+        logger.error(f"Failed to check secret {secret_arn}: {e}")
+        return {
+            'secret_arn': secret_arn,
+            'status': 'error',
+            'error': str(e)
+        }, f"Failed to access secret: {secret_arn}"
+
+    # VersionIdsToStages is not paginated: it lists every version that carries a
+    # staging label, so AWSPENDING is always visible here without
+    # list_secret_version_ids.
+    return _assess_secret(metadata, metadata.get('VersionIdsToStages', {}))
+
+
+def _assess_secret(
+    metadata: Dict[str, Any],
+    versions: Dict[str, List[str]]
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Derive the health-check result for a described or listed secret.
+
+    Args:
+        metadata: describe_secret response or list_secrets entry
+        versions: Version ID to staging labels mapping of the secret
+
+    Returns:
+        Tuple of (result entry, issue or None)
+    """
+    secret_name = metadata['Name']
+
+    # Check rotation configuration
+    rotation_enabled = metadata.get('RotationEnabled', False)
+    last_rotation = metadata.get('LastRotatedDate')
+    next_rotation = metadata.get('NextRotationDate')
+
+    # Check for pending rotation versions
+    has_pending = any('AWSPENDING' in stages for stages in versions.values())
+
+    status = 'healthy'
+    issue = None
+    if has_pending:
+        status = 'pending_rotation'
+        issue = f"{secret_name}: Has pending rotation version"
+    elif not rotation_enabled:
+        status = 'rotation_disabled'
+        issue = f"{secret_name}: Rotation is disabled"
+
+    return {
+        'secret_name': secret_name,
+        'status': status,
+        'rotation_enabled': rotation_enabled,
+        # Unix epoch seconds
+        'last_rotation': int(last_rotation.timestamp()) if last_rotation else None,
+        'next_rotation': int(next_rotation.timestamp()) if next_rotation else None
+    }, issue
+
+
+def _list_rotated_secrets() -> Iterator[Dict[str, Any]]:
+    """Yield list_secrets entries for every secret tagged with a SecretType."""
+    paginator = secrets_client.get_paginator('list_secrets')
+    pages = paginator.paginate(
+        Filters=[{'Key': 'tag-key', 'Values': ['SecretType']}],
+        PaginationConfig={'PageSize': LIST_SECRETS_PAGE_SIZE}
+    )
+    for page in pages:
+        yield from page['SecretList']
+
+
 def handle_manual_rotation(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Handle manual rotation trigger.
@@ -226,7 +440,7 @@ def handle_manual_rotation(event: Dict[str, Any]) -> Dict[str, Any]:
 
     try:
         # Get secret metadata
-        metadata = secrets_client.describe_secret(SecretId=secret_arn)
+        metadata, _ = _describe_cached(secret_arn)
         secret_name = metadata['Name']
 
         # Trigger rotation
@@ -241,7 +455,7 @@ def handle_manual_rotation(event: Dict[str, Any]) -> Dict[str, Any]:
 
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': _dumps({
                 'message': 'Manual rotation triggered successfully',
                 'secret': secret_name,
                 'version_id': response.get('VersionId')
@@ -253,6 +467,32 @@ def handle_manual_rotation(event: Dict[str, Any]) -> Dict[str, Any]:
         raise
 
 
+def _describe_cached(secret_arn: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Describe a secret, reusing the result for DESCRIBE_CACHE_TTL_SECONDS.
+
+    Only for name/tag lookups: rollback and health checks read the version
+    stages and always describe the secret afresh.
+
+    Returns:
+        Tuple of (secret metadata, SecretType tag value or 'Unknown')
+    """
+    now = time.monotonic()
+    cached = _describe_cache.get(secret_arn)
+    if cached and cached[0] > now:
+        return cached[1], cached[2]
+
+    metadata = secrets_client.describe_secret(SecretId=secret_arn)
+    secret_type = next(
+        (tag['Value'] for tag in metadata.get('Tags', ()) if tag['Key'] == 'SecretType'),
+        'Unknown'
+    )
+    if len(_describe_cache) >= DESCRIBE_CACHE_MAX_SIZE:
+        _describe_cache.clear()
+    _describe_cache[secret_arn] = (now + DESCRIBE_CACHE_TTL_SECONDS, metadata, secret_type)
+    return metadata, secret_type
+
+
 def rollback_rotation(
     client: Any,
     secret_arn: str,
@@ -273,11 +513,10 @@ def rollback_rotation(
         versions = metadata.get('VersionIdsToStages', {})
 
         # Find the current version
-        current_version = None
-        for version_id, stages in versions.items():
-            if 'AWSCURRENT' in stages:
-                current_version = version_id
-                break
+        current_version = next(
+            (version_id for version_id, stages in versions.items() if 'AWSCURRENT' in stages),
+            None
+        )
 
         if not current_version:
             logger.error("No current version found during rollback")
@@ -292,9 +531,11 @@ def rollback_rotation(
             )
             logger.info(f"Removed AWSPENDING stage from version {token}")
         except ClientError as e:
-            if 'ResourceNotFoundException' not in str(e):
+            if e.response.get('Error', {}).get('Code') != 'ResourceNotFoundException':
                 raise
 
+        _describe_cache.pop(secret_arn, None)
+        invalidate_secret_cache(secret_arn)
         logger.info(f"Rollback completed. Current version: {current_version}")
 
     except Exception as e:
@@ -306,6 +547,10 @@ def get_secret_value(secret_arn: str, version_stage: str = 'AWSCURRENT') -> Dict
     """
     Retrieve a secret value from Secrets Manager.
 
+    Parsed values are memoized per (ARN, stage) for SECRET_VALUE_CACHE_TTL_SECONDS,
+    or until invalidate_secret_cache is called for the secret, which happens on
+    finishSecret and on rollback.
+
     Args:
         secret_arn: ARN of the secret
         version_stage: Version stage to retrieve (AWSCURRENT or AWSPENDING)
@@ -313,12 +558,45 @@ def get_secret_value(secret_arn: str, version_stage: str = 'AWSCURRENT') -> Dict
     Returns:
         Parsed secret value as dictionary
     """
+    key = (secret_arn, version_stage)
+    now = time.monotonic()
+    cached = _secret_value_cache.get(key)
+    if cached and cached[0] > now:
+        return dict(cached[1])
+
     try:
         response = secrets_client.get_secret_value(
             SecretId=secret_arn,
             VersionStage=version_stage
         )
-        return json.loads(response['SecretString'])
     except ClientError as e:
         logger.error(f"Failed to get secret value: {e}")
         raise
+
+    value = _loads(response['SecretString'])
+    if len(_secret_value_cache) >= SECRET_VALUE_CACHE_MAX_SIZE:
+        _secret_value_cache.clear()
+    _secret_value_cache[key] = (now + SECRET_VALUE_CACHE_TTL_SECONDS, value)
+    return dict(value)
+
+
+def invalidate_secret_cache(secret_arn: str) -> None:
+    """Drop every cached value of a secret, whatever its version stage."""
+    for key in [key for key in _secret_value_cache if key[0] == secret_arn]:
+        _secret_value_cache.pop(key, None)
+
+
+def _dumps(value: Any) -> str:
+    """Serialize to a JSON string (orjson when bundled, stdlib json otherwise)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            value, default=str, option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(value, default=str)
+
+
+def _loads(value: str) -> Any:
+    """Parse a JSON string (orjson when bundled, stdlib json otherwise)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(value)
+    return json.loads(value)
@@ -6,13 +6,52 @@ Extracts named entities from user messages for context understanding
 import logging
 import re
 from enum import Enum
-from dataclasses import dataclass, field
-from typing import Optional, Any
+from dataclasses import dataclass
+from itertools import chain
+from typing import Callable, Iterable, Iterator, Optional, Any
 from datetime import datetime, date, time
-from langdetect import detect
+from langdetect import DetectorFactory, detect
+
+# Optional single-pass multi-pattern scanner
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# langdetect loads its language profiles on the first detect() call; pay that at
+# import time instead of on the first chatbot message, with deterministic results
+DetectorFactory.seed = 0
+try:
+    detect("warmup")
+except Exception:
+    logger.warning("Language detection warm-up failed", exc_info=True)
+
+# Separators stripped from phone numbers, incl. the no-break spaces common in French text
+_PHONE_STRIP = str.maketrans("", "", " \t\n\r\f\v\u00a0\u202f.-")
+
+
+def _keyword_regex(keywords: Iterable[str]) -> re.Pattern[str]:
+    """Compile keywords into a single case-insensitive, word-bounded alternation"""
+    alternatives = sorted(map(re.escape, keywords), key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.IGNORECASE)
+
+
+def _outermost_spans(spans: list[tuple[int, int, str, str]]) -> Iterator[tuple[int, int, str, str]]:
+    """
+    Drop keyword matches nested in a longer one ("stage" inside "main stage")
+
+    Spans are (start, end, value, raw_text); survivors are yielded in text order.
+    """
+    spans.sort(key=lambda span: (span[0], -span[1]))
+    covered_end = -1
+    for span in spans:
+        if span[1] > covered_end:
+            covered_end = span[1]
+            yield span
+
 
 class EntityType(str, Enum):
     """Types of entities that can be extracted from user messages"""
@@ -56,9 +95,9 @@ class EntityType(str, Enum):
     LANGUAGE = "language"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Entity:
-    """Represents an extracted entity"""
+    """Represents an extracted entity (immutable, no per-instance __dict__)"""
 
     type: EntityType
     value: Any
@@ -66,7 +105,7 @@ class Entity:
     start: int
     end: int
     confidence: float = 1.0
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: Optional[dict[str, Any]] = None
 
 
 class EntityExtractor:
@@ -102,6 +141,32 @@ class EntityExtractor:
         },
     }
 
+    # Date pattern: numeric, French month or English month, dispatched on named groups
+    DATE_PATTERN = re.compile(
+        r"(?P<d1>\d{1,2})[/\-.](?P<m1>\d{1,2})(?:[/\-.](?P<y>\d{2,4}))?"
+        r"|(?P<d2>\d{1,2})\s+(?P<mfr>janvier|fevrier|mars|avril|mai|juin|juillet|aout"
+        r"|septembre|octobre|novembre|decembre)"
+        r"|(?P<d3>\d{1,2})\s+(?P<men>january|february|march|april|may|june|july|august"
+        r"|september|october|november|december)",
+        re.IGNORECASE,
+    )
+
+    # Month names (French and English)
+    MONTHS = {
+        "janvier": 1, "january": 1,
+        "fevrier": 2, "february": 2,
+        "mars": 3, "march": 3,
+        "avril": 4, "april": 4,
+        "mai": 5, "may": 5,
+        "juin": 6, "june": 6,
+        "juillet": 7, "july": 7,
+        "aout": 8, "august": 8,
+        "septembre": 9, "september": 9,
+        "octobre": 10, "october": 10,
+        "novembre": 11, "november": 11,
+        "decembre": 12, "december": 12,
+    }
+
     # Time patterns
     TIME_PATTERN = r"(\d{1,2})[h:](\d{2})?"
     TIME_PATTERN_12H = r"(\d{1,2}):?(\d{2})?\s*(am|pm)"
@@ -192,6 +257,9 @@ class EntityExtractor:
         "en": ["red", "blue", "green", "yellow", "black", "white", "pink", "orange", "purple", "gray", "brown"],
     }
 
+    # Prefilter pattern id -> extractor family (same order as _build_prefilter)
+    PREFILTER_FAMILIES = ("date", "time", "time", "amount", "quantity", "email", "phone", "order")
+
     def __init__(
         self,
         artists: Optional[list[str]] = None,
@@ -210,6 +278,19 @@ class EntityExtractor:
         self.stages = [s.lower() for s in (stages or [])]
         self.zones = [z.lower() for z in (zones or [])]
 
+        # One alternation per language; longest keywords first so "apres-demain" beats "demain"
+        self._day_res = {
+            lang: _keyword_regex(days) for lang, days in self.DAY_PATTERNS.items()
+        }
+        self._color_res = {
+            lang: _keyword_regex(colors) for lang, colors in self.COLORS.items()
+        }
+
+        # Prefilter database: one scan tells which regex families can match at all
+        self._hs_db = self._build_prefilter() if HYPERSCAN_AVAILABLE else None
+
+        self._build_pipeline()
+
         logger.info(
             f"Entity extractor initialized with {len(self.artists)} artists, "
             f"{len(self.stages)} stages, {len(self.zones)} zones"
@@ -226,8 +307,22 @@ class EntityExtractor:
         Returns:
             List of extracted entities
         """
-        entities: list[Entity] = []
+        return list(self.iter_extract(text, language))
+
+    def iter_extract(self, text: str, language: Optional[str] = None) -> Iterator[Entity]:
+        """
+        Lazily extract entities from user message
+
+        Entities are yielded as they are found, so callers filtering on a
+        single EntityType or stopping at the first hit skip the remaining scans.
 
+        Args:
+            text: User message
+            language: Language code (fr/en), auto-detected if not provided
+
+        Yields:
+            Extracted entities, followed by the detected language entity
+        """
         # Detect language if not provided
         if not language:
             try:
@@ -239,95 +334,133 @@ class EntityExtractor:
 
         text_lower = text.lower()
 
+        # Skip the re scans of families with no match anywhere in the text
+        hits = self._prefilter(text) if self._hs_db is not None else None
+
         # Extract various entity types
-        entities.extend(self._extract_dates(text, language))
-        entities.extend(self._extract_times(text))
-        entities.extend(self._extract_days(text_lower, language))
-        entities.extend(self._extract_amounts(text))
-        entities.extend(self._extract_quantities(text))
-        entities.extend(self._extract_emails(text))
-        entities.extend(self._extract_phones(text))
-        entities.extend(self._extract_order_numbers(text))
-        entities.extend(self._extract_poi_types(text_lower, language))
-        entities.extend(self._extract_ticket_types(text_lower))
-        entities.extend(self._extract_artists(text_lower))
-        entities.extend(self._extract_stages(text_lower))
-        entities.extend(self._extract_zones(text_lower))
-        entities.extend(self._extract_colors(text_lower, language))
+        extractors = [
+            method(text_lower if lowered else text, language)
+            if with_language
+            else method(text_lower if lowered else text)
+            for family, method, lowered, with_language in self._pipeline
+            if hits is None or family is None or family in hits
+        ]
+
+        yield from chain.from_iterable(extractors)
 
         # Add language entity
-        entities.append(
-            Entity(
-                type=EntityType.LANGUAGE,
-                value=language,
-                raw_text=language,
-                start=0,
-                end=0,
-                confidence=0.9,
-            )
+        yield Entity(
+            type=EntityType.LANGUAGE,
+            value=language,
+            raw_text=language,
+            start=0,
+            end=0,
+            confidence=0.9,
         )
 
-        return entities
+    def _build_pipeline(self) -> None:
+        """
+        Specialize the extractor sequence to the festival data currently loaded
 
-    def _extract_dates(self, text: str, language: str) -> list[Entity]:
-        """Extract date entities from text"""
-        entities: list[Entity] = []
+        Entries are (prefilter family, method, takes lowercased text, takes language).
+        Artist, stage and zone extractors are left out while their lists are empty.
+        """
+        self._pipeline: list[tuple[Optional[str], Callable[..., Iterator[Entity]], bool, bool]] = [
+            entry
+            for entry in (
+                ("date", self._extract_dates, False, True),
+                ("time", self._extract_times, False, False),
+                (None, self._extract_days, True, True),
+                ("amount", self._extract_amounts, False, False),
+                ("quantity", self._extract_quantities, False, False),
+                ("email", self._extract_emails, False, False),
+                ("phone", self._extract_phones, False, False),
+                ("order", self._extract_order_numbers, False, False),
+                (None, self._extract_poi_types, True, True),
+                (None, self._extract_ticket_types, True, False),
+                (None, self._extract_artists, True, False) if self.artists else None,
+                (None, self._extract_stages, True, False) if self.stages else None,
+                (None, self._extract_zones, True, False) if self.zones else None,
+                (None, self._extract_colors, True, True),
+            )
+            if entry is not None
+        ]
 
-        # Pattern for dates like "15/07", "15 juillet", "July 15"
-        date_patterns = [
-            (r"(\d{1,2})[/\-.](\d{1,2})(?:[/\-.](\d{2,4}))?", "numeric"),
-            (r"(\d{1,2})\s+(janvier|fevrier|mars|avril|mai|juin|juillet|aout|septembre|octobre|novembre|decembre)", "fr_month"),
-            (r"(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december)", "en_month"),
+    def _build_prefilter(self) -> "hyperscan.Database":
+        """Compile every regex family into a single Hyperscan database"""
+        db = hyperscan.Database()
+        flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+        caseless = flags | hyperscan.HS_FLAG_CASELESS
+        patterns = [
+            (self.DATE_PATTERN.pattern, caseless),
+            (self.TIME_PATTERN, caseless),
+            (self.TIME_PATTERN_12H, caseless),
+            (self.AMOUNT_PATTERN, caseless),
+            (self.QUANTITY_PATTERN, caseless),
+            (self.EMAIL_PATTERN, flags),
+            (self.PHONE_PATTERN, flags),
+            (self.ORDER_PATTERN, caseless),
         ]
+        db.compile(
+            expressions=[pattern.encode("utf-8") for pattern, _ in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[pattern_flags for _, pattern_flags in patterns],
+        )
+        return db
 
-        for pattern, pattern_type in date_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                try:
-                    raw_text = match.group(0)
-                    if pattern_type == "numeric":
-                        day = int(match.group(1))
-                        month = int(match.group(2))
-                        year = int(match.group(3)) if match.group(3) else datetime.now().year
-                        if year < 100:
-                            year += 2000
-                        date_value = date(year, month, day)
-                    else:
-                        day = int(match.group(1))
-                        month_name = match.group(2).lower()
-                        month_map = {
-                            "janvier": 1, "january": 1,
-                            "fevrier": 2, "february": 2,
-                            "mars": 3, "march": 3,
-                            "avril": 4, "april": 4,
-                            "mai": 5, "may": 5,
-                            "juin": 6, "june": 6,
-                            "juillet": 7, "july": 7,
-                            "aout": 8, "august": 8,
-                            "septembre": 9, "september": 9,
-                            "octobre": 10, "october": 10,
-                            "novembre": 11, "november": 11,
-                            "decembre": 12, "december": 12,
-                        }
-                        month = month_map.get(month_name, 1)
-                        date_value = date(datetime.now().year, month, day)
-
-                    entities.append(
-                        Entity(
-                            type=EntityType.DATE,
-                            value=date_value,
-                            raw_text=raw_text,
-                            start=match.start(),
-                            end=match.end(),
-                        )
-                    )
-                except (ValueError, IndexError):
-                    continue
+    def _prefilter(self, text: str) -> set[str]:
+        """Return the regex families that have at least one match in text"""
+        ids: set[int] = set()
+
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+            ids.add(pattern_id)
 
-        return entities
+        self._hs_db.scan(text.encode("utf-8"), match_event_handler=on_match)
+        return {self.PREFILTER_FAMILIES[pattern_id] for pattern_id in ids}
 
-    def _extract_times(self, text: str) -> list[Entity]:
+    def _extract_dates(self, text: str, language: str) -> Iterator[Entity]:
+        """Extract date entities from text"""
+        entity = Entity
+        entity_type = EntityType.DATE
+
+        # Dates like "15/07", "15 juillet", "July 15" are matched in a single pass;
+        # the named group that participated tells which form was found
+        for match in self.DATE_PATTERN.finditer(text):
+            try:
+                raw_text = match.group(0)
+                if match["m1"] is not None:
+                    day = int(match["d1"])
+                    month = int(match["m1"])
+                    year = int(match["y"]) if match["y"] else datetime.now().year
+                    if year < 100:
+                        year += 2000
+                    date_value = date(year, month, day)
+                else:
+                    if match["mfr"] is not None:
+                        day = int(match["d2"])
+                        month_name = match["mfr"].lower()
+                    else:
+                        day = int(match["d3"])
+                        month_name = match["men"].lower()
+                    month = self.MONTHS.get(month_name, 1)
+                    date_value = date(datetime.now().year, month, day)
+
+                start, end = match.span()
+                yield entity(
+                    type=entity_type,
+                    value=date_value,
+                    raw_text=raw_text,
+                    start=start,
+                    end=end,
+                )
+            except (ValueError, IndexError):
+                continue
+
+    def _extract_times(self, text: str) -> Iterator[Entity]:
         """Extract time entities from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.TIME
 
         # 24h format (15h30, 15:30)
         for match in re.finditer(self.TIME_PATTERN, text, re.IGNORECASE):
@@ -335,14 +468,13 @@ class EntityExtractor:
                 hour = int(match.group(1))
                 minute = int(match.group(2)) if match.group(2) else 0
                 if 0 <= hour <= 23 and 0 <= minute <= 59:
-                    entities.append(
-                        Entity(
-                            type=EntityType.TIME,
-                            value=time(hour, minute),
-                            raw_text=match.group(0),
-                            start=match.start(),
-                            end=match.end(),
-                        )
+                    start, end = match.span()
+                    yield entity(
+                        type=entity_type,
+                        value=time(hour, minute),
+                        raw_text=match.group(0),
+                        start=start,
+                        end=end,
                     )
             except (ValueError, IndexError):
                 continue
@@ -357,243 +489,220 @@ class EntityExtractor:
                     hour += 12
                 elif am_pm == "am" and hour == 12:
                     hour = 0
-                entities.append(
-                    Entity(
-                        type=EntityType.TIME,
-                        value=time(hour, minute),
-                        raw_text=match.group(0),
-                        start=match.start(),
-                        end=match.end(),
-                    )
+                start, end = match.span()
+                yield entity(
+                    type=entity_type,
+                    value=time(hour, minute),
+                    raw_text=match.group(0),
+                    start=start,
+                    end=end,
                 )
             except (ValueError, IndexError):
                 continue
 
-        return entities
-
-    def _extract_days(self, text: str, language: str) -> list[Entity]:
+    def _extract_days(self, text: str, language: str) -> Iterator[Entity]:
         """Extract day references from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.DAY
         patterns = self.DAY_PATTERNS.get(language, self.DAY_PATTERNS["fr"])
+        day_re = self._day_res.get(language, self._day_res["fr"])
+
+        for match in day_re.finditer(text):
+            start, end = match.span()
+            raw_text = match.group(0)
+            day_text = raw_text.lower()
+            yield entity(
+                type=entity_type,
+                value=patterns.get(day_text, day_text),
+                raw_text=raw_text,
+                start=start,
+                end=end,
+            )
 
-        for day_text, day_value in patterns.items():
-            pattern = rf"\b{re.escape(day_text)}\b"
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                entities.append(
-                    Entity(
-                        type=EntityType.DAY,
-                        value=day_value,
-                        raw_text=match.group(0),
-                        start=match.start(),
-                        end=match.end(),
-                    )
-                )
-
-        return entities
-
-    def _extract_amounts(self, text: str) -> list[Entity]:
+    def _extract_amounts(self, text: str) -> Iterator[Entity]:
         """Extract monetary amounts from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.AMOUNT
 
         for match in re.finditer(self.AMOUNT_PATTERN, text, re.IGNORECASE):
             amount_str = match.group(1).replace(",", ".")
-            entities.append(
-                Entity(
-                    type=EntityType.AMOUNT,
-                    value=float(amount_str),
-                    raw_text=match.group(0),
-                    start=match.start(),
-                    end=match.end(),
-                    metadata={"currency": "EUR"},
-                )
+            start, end = match.span()
+            yield entity(
+                type=entity_type,
+                value=float(amount_str),
+                raw_text=match.group(0),
+                start=start,
+                end=end,
+                metadata={"currency": "EUR"},
             )
 
-        return entities
-
-    def _extract_quantities(self, text: str) -> list[Entity]:
+    def _extract_quantities(self, text: str) -> Iterator[Entity]:
         """Extract ticket/person quantities from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.QUANTITY
 
         for match in re.finditer(self.QUANTITY_PATTERN, text, re.IGNORECASE):
-            entities.append(
-                Entity(
-                    type=EntityType.QUANTITY,
-                    value=int(match.group(1)),
-                    raw_text=match.group(0),
-                    start=match.start(),
-                    end=match.end(),
-                )
+            start, end = match.span()
+            yield entity(
+                type=entity_type,
+                value=int(match.group(1)),
+                raw_text=match.group(0),
+                start=start,
+                end=end,
             )
 
-        return entities
-
-    def _extract_emails(self, text: str) -> list[Entity]:
+    def _extract_emails(self, text: str) -> Iterator[Entity]:
         """Extract email addresses from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.EMAIL
 
         for match in re.finditer(self.EMAIL_PATTERN, text):
-            entities.append(
-                Entity(
-                    type=EntityType.EMAIL,
-                    value=match.group(0).lower(),
-                    raw_text=match.group(0),
-                    start=match.start(),
-                    end=match.end(),
-                )
+            start, end = match.span()
+            yield entity(
+                type=entity_type,
+                value=match.group(0).lower(),
+                raw_text=match.group(0),
+                start=start,
+                end=end,
             )
 
-        return entities
-
-    def _extract_phones(self, text: str) -> list[Entity]:
+    def _extract_phones(self, text: str) -> Iterator[Entity]:
         """Extract phone numbers from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.PHONE
 
         for match in re.finditer(self.PHONE_PATTERN, text):
-            phone = re.sub(r"[\s.\-]", "", match.group(0))
-            entities.append(
-                Entity(
-                    type=EntityType.PHONE,
-                    value=phone,
-                    raw_text=match.group(0),
-                    start=match.start(),
-                    end=match.end(),
-                )
+            phone = match.group(0).translate(_PHONE_STRIP)
+            start, end = match.span()
+            yield entity(
+                type=entity_type,
+                value=phone,
+                raw_text=match.group(0),
+                start=start,
+                end=end,
             )
 
-        return entities
-
-    def _extract_order_numbers(self, text: str) -> list[Entity]:
+    def _extract_order_numbers(self, text: str) -> Iterator[Entity]:
         """Extract order/booking numbers from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.ORDER_NUMBER
 
         for match in re.finditer(self.ORDER_PATTERN, text, re.IGNORECASE):
-            entities.append(
-                Entity(
-                    type=EntityType.ORDER_NUMBER,
-                    value=match.group(0).upper(),
-                    raw_text=match.group(0),
-                    start=match.start(),
-                    end=match.end(),
-                )
+            start, end = match.span()
+            yield entity(
+                type=entity_type,
+                value=match.group(0).upper(),
+                raw_text=match.group(0),
+                start=start,
+                end=end,
             )
 
-        return entities
-
-    def _extract_poi_types(self, text: str, language: str) -> list[Entity]:
+    def _extract_poi_types(self, text: str, language: str) -> Iterator[Entity]:
         """Extract point of interest types from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.POI_TYPE
         pois = self.POI_TYPES.get(language, self.POI_TYPES["fr"])
 
+        spans = []
         for poi_text, poi_type in pois.items():
-            if poi_text in text:
-                start = text.find(poi_text)
-                entities.append(
-                    Entity(
-                        type=EntityType.POI_TYPE,
-                        value=poi_type,
-                        raw_text=poi_text,
-                        start=start,
-                        end=start + len(poi_text),
-                    )
-                )
-
-        return entities
+            start = text.find(poi_text)
+            if start != -1:
+                spans.append((start, start + len(poi_text), poi_type, poi_text))
+
+        for start, end, poi_type, poi_text in _outermost_spans(spans):
+            yield entity(
+                type=entity_type,
+                value=poi_type,
+                raw_text=poi_text,
+                start=start,
+                end=end,
+            )
 
-    def _extract_ticket_types(self, text: str) -> list[Entity]:
+    def _extract_ticket_types(self, text: str) -> Iterator[Entity]:
         """Extract ticket type mentions from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.TICKET_TYPE
 
+        spans = []
         for ticket_text, ticket_type in self.TICKET_TYPES.items():
-            if ticket_text in text:
-                start = text.find(ticket_text)
-                entities.append(
-                    Entity(
-                        type=EntityType.TICKET_TYPE,
-                        value=ticket_type,
-                        raw_text=ticket_text,
-                        start=start,
-                        end=start + len(ticket_text),
-                    )
-                )
-
-        return entities
+            start = text.find(ticket_text)
+            if start != -1:
+                spans.append((start, start + len(ticket_text), ticket_type, ticket_text))
+
+        for start, end, ticket_type, ticket_text in _outermost_spans(spans):
+            yield entity(
+                type=entity_type,
+                value=ticket_type,
+                raw_text=ticket_text,
+                start=start,
+                end=end,
+            )
 
-    def _extract_artists(self, text: str) -> list[Entity]:
+    def _extract_artists(self, text: str) -> Iterator[Entity]:
         """Extract artist names from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.ARTIST
 
         for artist in self.artists:
             if artist in text:
                 start = text.find(artist)
-                entities.append(
-                    Entity(
-                        type=EntityType.ARTIST,
-                        value=artist,
-                        raw_text=artist,
-                        start=start,
-                        end=start + len(artist),
-                    )
+                yield entity(
+                    type=entity_type,
+                    value=artist,
+                    raw_text=artist,
+                    start=start,
+                    end=start + len(artist),
                 )
 
-        return entities
-
-    def _extract_stages(self, text: str) -> list[Entity]:
+    def _extract_stages(self, text: str) -> Iterator[Entity]:
         """Extract stage names from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.STAGE
 
         for stage in self.stages:
             if stage in text:
                 start = text.find(stage)
-                entities.append(
-                    Entity(
-                        type=EntityType.STAGE,
-                        value=stage,
-                        raw_text=stage,
-                        start=start,
-                        end=start + len(stage),
-                    )
+                yield entity(
+                    type=entity_type,
+                    value=stage,
+                    raw_text=stage,
+                    start=start,
+                    end=start + len(stage),
                 )
 
-        return entities
-
-    def _extract_zones(self, text: str) -> list[Entity]:
+    def _extract_zones(self, text: str) -> Iterator[Entity]:
         """Extract zone names from text"""
-        entities: list[Entity] = []
+        entity = Entity
+        entity_type = EntityType.ZONE
 
         for zone in self.zones:
             if zone in text:
                 start = text.find(zone)
-                entities.append(
-                    Entity(
-                        type=EntityType.ZONE,
-                        value=zone,
-                        raw_text=zone,
-                        start=start,
-                        end=start + len(zone),
-                    )
+                yield entity(
+                    type=entity_type,
+                    value=zone,
+                    raw_text=zone,
+                    start=start,
+                    end=start + len(zone),
                 )
 
-        return entities
-
-    def _extract_colors(self, text: str, language: str) -> list[Entity]:
+    def _extract_colors(self, text: str, language: str) -> Iterator[Entity]:
         """Extract color mentions (useful for lost items)"""
-        entities: list[Entity] = []
-        colors = self.COLORS.get(language, self.COLORS["fr"])
-
-        for color in colors:
-            if color in text:
-                start = text.find(color)
-                entities.append(
-                    Entity(
-                        type=EntityType.COLOR,
-                        value=color,
-                        raw_text=color,
-                        start=start,
-                        end=start + len(color),
-                    )
-                )
-
-        return entities
+        entity = Entity
+        entity_type = EntityType.COLOR
+        color_re = self._color_res.get(language, self._color_res["fr"])
+
+        # Whole words only: "red" must not match inside "prepared"
+        for match in color_re.finditer(text):
+            start, end = match.span()
+            color = match.group(0)
+            yield entity(
+                type=entity_type,
+                value=color,
+                raw_text=color,
+                start=start,
+                end=end,
+            )
 
     def update_festival_data(
         self,
@@ -609,6 +718,8 @@ class EntityExtractor:
         if zones:
             self.zones = [z.lower() for z in zones]
 
+        self._build_pipeline()
+
         logger.info(
             f"Updated festival data: {len(self.artists)} artists, "
             f"{len(self.stages)} stages, {len(self.zones)} zones"
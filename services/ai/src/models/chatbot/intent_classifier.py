@@ -3,15 +3,66 @@ Intent Classifier Module
 Classifies user messages into predefined intents using sentence embeddings
 """
 
+import hashlib
+import json
 import logging
+import os
+import re
+import threading
 from enum import Enum
-from dataclasses import dataclass, field
-from typing import Optional
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+# Optional PyTorch encoder; serving from an ONNX export does not need it
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+# Optional SIMD inner-product index for example-level search
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Optional ONNX Runtime encoder: serving needs only the Rust tokenizer and a session
+try:
+    import onnxruntime
+    from tokenizers import Tokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Exporting a model to ONNX with dynamic int8 quantization (once per model)
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ONNX_EXPORT_AVAILABLE = True
+except ImportError:
+    ONNX_EXPORT_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r"\w+")
+
+# Filler words a keyword-only message may still contain ("au feu", "merci beaucoup")
+_KEYWORD_STOPWORDS = frozenset((
+    "a", "à", "au", "aux", "d", "de", "des", "du", "l", "la", "le", "les", "un", "une",
+    "beaucoup", "svp", "stp", "the", "an", "please", "very", "much", "you", "there",
+))
+
+
+def _user_cache_dir(name: str) -> Path:
+    """Per-user cache directory: $XDG_CACHE_HOME/festival-ai/<name>, else ~/.cache/..."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "festival-ai" / name
+
 
 class Intent(str, Enum):
     """Supported chatbot intents for festival management"""
@@ -73,14 +124,39 @@ class IntentResult:
 
     intent: Intent
     confidence: float
-    all_scores: dict[str, float] = field(default_factory=dict)
+    # Scores aligned with labels; the labels tuple is shared by every result
+    all_scores: Optional[np.ndarray] = None
     requires_escalation: bool = False
+    labels: tuple[str, ...] = ()
+
+    def as_dict(self) -> dict[str, float]:
+        """Return all_scores as a {label: score} dict"""
+        if self.all_scores is None:
+            return {}
+        return dict(zip(self.labels, self.all_scores.tolist(), strict=True))
+
+
+@dataclass(frozen=True)
+class _ScoringState:
+    """Everything classification reads, swapped as a whole when examples change"""
+
+    intents: tuple[Intent, ...]
+    labels: tuple[str, ...]
+    # Example rows in the configured storage dtype, grouped by intent
+    scoring_matrix: np.ndarray
+    row_scale: Optional[np.ndarray]
+    # First row of each intent's group in the example matrices
+    intent_offsets: np.ndarray
+    # Position in intents of the intent each example belongs to
+    example_intent_ids: np.ndarray
+    example_matrix: np.ndarray
+    example_index: Optional["faiss.IndexFlatIP"] = None
 
 
 # Training examples for each intent (French and English)
-INTENT_EXAMPLES: dict[Intent, list[str]] = {
+INTENT_EXAMPLES: dict[Intent, tuple[str, ...]] = {
     # FAQ
-    Intent.FAQ_HOURS: [
+    Intent.FAQ_HOURS: (
         "quels sont les horaires du festival",
         "a quelle heure ouvre le festival",
         "heure fermeture",
@@ -89,8 +165,8 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "opening hours",
         "when does it start",
         "horaires d'ouverture",
-    ],
-    Intent.FAQ_ACCESS: [
+    ),
+    Intent.FAQ_ACCESS: (
         "comment acceder au festival",
         "ou est l'entree principale",
         "comment venir au festival",
@@ -98,8 +174,8 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "where is the entrance",
         "acces au site",
         "plan d'acces",
-    ],
-    Intent.FAQ_RULES: [
+    ),
+    Intent.FAQ_RULES: (
         "quelles sont les regles",
         "reglement interieur",
         "qu'est-ce qui est interdit",
@@ -107,16 +183,16 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "what is forbidden",
         "peut-on apporter de la nourriture",
         "objets interdits",
-    ],
-    Intent.FAQ_PARKING: [
+    ),
+    Intent.FAQ_PARKING: (
         "ou se garer",
         "parking disponible",
         "prix du parking",
         "where to park",
         "parking information",
         "places de parking",
-    ],
-    Intent.FAQ_TRANSPORT: [
+    ),
+    Intent.FAQ_TRANSPORT: (
         "comment venir en transport",
         "bus pour le festival",
         "navette",
@@ -124,9 +200,9 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "shuttle bus",
         "metro station",
         "gare la plus proche",
-    ],
+    ),
     # Program
-    Intent.PROGRAM_ARTISTS: [
+    Intent.PROGRAM_ARTISTS: (
         "qui sont les artistes",
         "lineup",
         "programmation artistes",
@@ -134,16 +210,16 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "headliners",
         "tetes d'affiche",
         "artiste ce soir",
-    ],
-    Intent.PROGRAM_STAGES: [
+    ),
+    Intent.PROGRAM_STAGES: (
         "combien de scenes",
         "ou est la main stage",
         "plan des scenes",
         "where are the stages",
         "stage locations",
         "scene principale",
-    ],
-    Intent.PROGRAM_SCHEDULE: [
+    ),
+    Intent.PROGRAM_SCHEDULE: (
         "programme du jour",
         "horaires des concerts",
         "qui joue maintenant",
@@ -151,100 +227,100 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "when does X play",
         "a quelle heure joue",
         "prochains concerts",
-    ],
-    Intent.PROGRAM_FAVORITES: [
+    ),
+    Intent.PROGRAM_FAVORITES: (
         "mes artistes favoris",
         "artistes que je suis",
         "my favorite artists",
         "notifications artistes",
         "rappel concert",
-    ],
+    ),
     # Cashless
-    Intent.CASHLESS_BALANCE: [
+    Intent.CASHLESS_BALANCE: (
         "quel est mon solde",
         "combien il me reste",
         "check my balance",
         "cashless balance",
         "solde cashless",
         "montant restant",
-    ],
-    Intent.CASHLESS_TOPUP: [
+    ),
+    Intent.CASHLESS_TOPUP: (
         "recharger mon compte",
         "ajouter de l'argent",
         "top up my account",
         "add money",
         "rechargement cashless",
         "crediter mon bracelet",
-    ],
-    Intent.CASHLESS_PROBLEM: [
+    ),
+    Intent.CASHLESS_PROBLEM: (
         "probleme avec mon cashless",
         "mon bracelet ne marche pas",
         "cashless not working",
         "payment issue",
         "paiement refuse",
         "erreur cashless",
-    ],
-    Intent.CASHLESS_REFUND: [
+    ),
+    Intent.CASHLESS_REFUND: (
         "remboursement cashless",
         "recuperer mon solde",
         "get my money back",
         "cashless refund",
         "rembourser mon compte",
-    ],
+    ),
     # Ticketing
-    Intent.TICKET_BUY: [
+    Intent.TICKET_BUY: (
         "acheter un billet",
         "reserver une place",
         "buy a ticket",
         "purchase tickets",
         "commander des billets",
         "places disponibles",
-    ],
-    Intent.TICKET_MODIFY: [
+    ),
+    Intent.TICKET_MODIFY: (
         "modifier ma reservation",
         "changer mon billet",
         "modify my booking",
         "change my ticket",
         "upgrade mon billet",
-    ],
-    Intent.TICKET_CANCEL: [
+    ),
+    Intent.TICKET_CANCEL: (
         "annuler ma reservation",
         "cancel my ticket",
         "demande d'annulation",
         "remboursement billet",
-    ],
-    Intent.TICKET_STATUS: [
+    ),
+    Intent.TICKET_STATUS: (
         "statut de ma commande",
         "ou en est ma reservation",
         "order status",
         "confirmation de commande",
         "numero de commande",
-    ],
-    Intent.TICKET_QRCODE: [
+    ),
+    Intent.TICKET_QRCODE: (
         "probleme qr code",
         "qr code illisible",
         "qr code not working",
         "scan qr code",
         "mon billet ne scanne pas",
-    ],
+    ),
     # Navigation
-    Intent.NAVIGATION_WHERE: [
+    Intent.NAVIGATION_WHERE: (
         "ou est",
         "comment aller a",
         "where is",
         "how to find",
         "localisation",
         "cherche",
-    ],
-    Intent.NAVIGATION_WC: [
+    ),
+    Intent.NAVIGATION_WC: (
         "ou sont les toilettes",
         "wc",
         "where are the toilets",
         "bathrooms",
         "sanitaires",
         "douches",
-    ],
-    Intent.NAVIGATION_FOOD: [
+    ),
+    Intent.NAVIGATION_FOOD: (
         "ou manger",
         "restaurants",
         "food stands",
@@ -252,17 +328,17 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "bars",
         "boire un verre",
         "stands nourriture",
-    ],
-    Intent.NAVIGATION_MEDICAL: [
+    ),
+    Intent.NAVIGATION_MEDICAL: (
         "point medical",
         "premiers secours",
         "medical point",
         "first aid",
         "infirmerie",
         "pharmacie",
-    ],
+    ),
     # Emergency
-    Intent.EMERGENCY_MEDICAL: [
+    Intent.EMERGENCY_MEDICAL: (
         "urgence medicale",
         "besoin d'un medecin",
         "medical emergency",
@@ -270,8 +346,8 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "accident",
         "blessure grave",
         "appeler les secours",
-    ],
-    Intent.EMERGENCY_SECURITY: [
+    ),
+    Intent.EMERGENCY_SECURITY: (
         "probleme de securite",
         "agression",
         "security issue",
@@ -279,38 +355,38 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "vol",
         "bagarre",
         "appeler la securite",
-    ],
-    Intent.EMERGENCY_FIRE: [
+    ),
+    Intent.EMERGENCY_FIRE: (
         "incendie",
         "fire",
         "feu",
         "fumee",
         "smoke",
         "evacuation",
-    ],
+    ),
     # Lost & Found
-    Intent.LOST_ITEM_REPORT: [
+    Intent.LOST_ITEM_REPORT: (
         "j'ai perdu",
         "objet perdu",
         "i lost my",
         "lost item",
         "perdu mon telephone",
         "perdu mon sac",
-    ],
-    Intent.LOST_ITEM_FOUND: [
+    ),
+    Intent.LOST_ITEM_FOUND: (
         "j'ai trouve un objet",
         "found something",
         "objet trouve",
         "rendre un objet",
-    ],
-    Intent.LOST_ITEM_STATUS: [
+    ),
+    Intent.LOST_ITEM_STATUS: (
         "mon objet perdu",
         "retrouver mon objet",
         "lost item status",
         "avez-vous trouve",
-    ],
+    ),
     # General
-    Intent.GREETING: [
+    Intent.GREETING: (
         "bonjour",
         "salut",
         "hello",
@@ -318,32 +394,32 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "bonsoir",
         "coucou",
         "hey",
-    ],
-    Intent.GOODBYE: [
+    ),
+    Intent.GOODBYE: (
         "au revoir",
         "bye",
         "goodbye",
         "a bientot",
         "bonne soiree",
         "see you",
-    ],
-    Intent.THANKS: [
+    ),
+    Intent.THANKS: (
         "merci",
         "thanks",
         "thank you",
         "merci beaucoup",
         "super merci",
         "genial merci",
-    ],
-    Intent.HELP: [
+    ),
+    Intent.HELP: (
         "aide",
         "help",
         "que peux-tu faire",
         "what can you do",
         "comment ca marche",
         "besoin d'aide",
-    ],
-    Intent.HUMAN_ESCALATION: [
+    ),
+    Intent.HUMAN_ESCALATION: (
         "parler a un humain",
         "agent",
         "operateur",
@@ -352,7 +428,7 @@ INTENT_EXAMPLES: dict[Intent, list[str]] = {
         "conseiller",
         "quelqu'un de reel",
         "pas un robot",
-    ],
+    ),
 }
 
 
@@ -362,11 +438,41 @@ class IntentClassifier:
     Supports French and English languages
     """
 
+    MATRIX_DTYPES = ("float32", "float16", "int8")
+
+    # Intents whose single-word examples are unambiguous enough to skip the encoder
+    KEYWORD_INTENTS = frozenset({
+        Intent.EMERGENCY_MEDICAL,
+        Intent.EMERGENCY_SECURITY,
+        Intent.EMERGENCY_FIRE,
+        Intent.GREETING,
+        Intent.GOODBYE,
+        Intent.THANKS,
+        Intent.HELP,
+        Intent.HUMAN_ESCALATION,
+    })
+    KEYWORD_CONFIDENCE = 0.95
+    # Trigger words too ambiguous to bypass the encoder ("fire show", "mon vol",
+    # "aide medicale"); messages using them go through the encoder and its thresholds
+    KEYWORD_EXCLUDED = frozenset({"fire", "smoke", "vol", "aide", "accident"})
+
+    # Same sequence cap as the sentence-transformers model config
+    ONNX_MAX_LENGTH = 128
+
     def __init__(
         self,
         model_name: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
         confidence_threshold: float = 0.7,
         fallback_threshold: float = 0.5,
+        cache_size: int = 4096,
+        semantic_cache_size: int = 512,
+        semantic_cache_threshold: float = 0.97,
+        matrix_dtype: str = "float32",
+        use_onnx: bool = False,
+        onnx_dir: Optional[str] = None,
+        embedding_cache_dir: Optional[str] = None,
+        cache_embeddings: bool = True,
+        enabled_intent_prefixes: Optional[Iterable[str]] = None,
     ):
         """
         Initialize the intent classifier
@@ -375,25 +481,330 @@ class IntentClassifier:
             model_name: HuggingFace model for sentence embeddings
             confidence_threshold: Minimum confidence to accept an intent
             fallback_threshold: Threshold below which we suggest escalation
+            cache_size: Number of normalized messages whose result is memoized
+            semantic_cache_size: Number of recent query embeddings kept to answer
+                near-duplicate messages ("bonjour!", "bonjour 👋"); 0 disables it
+            semantic_cache_threshold: Cosine similarity above which a cached
+                near-duplicate result is reused
+            matrix_dtype: Storage of the example matrix, "float32", "float16"
+                (float32 accumulation, 2x smaller) or "int8" (per-row scaled,
+                int32 accumulation, 4x smaller)
+            use_onnx: Run the encoder through ONNX Runtime with dynamic int8
+                quantization instead of PyTorch; serving needs only onnxruntime
+                and tokenizers, exporting a missing model needs optimum
+            onnx_dir: Directory holding model_quantized.onnx and tokenizer.json,
+                exported there on first use; defaults to a per-model directory
+                under the user's cache dir ($XDG_CACHE_HOME or ~/.cache)
+            embedding_cache_dir: Where encoded training examples are stored so
+                restarts skip the encoder; defaults to the user's cache dir
+            cache_embeddings: Set to False to always encode examples at startup
+            enabled_intent_prefixes: Only load intents whose value starts with one
+                of these prefixes (e.g. ["faq_", "navigation_"]); messages for
+                the other intents then fall back to UNKNOWN
         """
+        if matrix_dtype not in self.MATRIX_DTYPES:
+            raise ValueError(
+                f"Unsupported matrix_dtype {matrix_dtype!r}, expected one of {self.MATRIX_DTYPES}"
+            )
+        self.matrix_dtype = matrix_dtype
         self.confidence_threshold = confidence_threshold
         self.fallback_threshold = fallback_threshold
+        self.model_name = model_name
+        self._use_onnx = use_onnx
+        self._embedding_cache_dir: Optional[Path] = None
+        if cache_embeddings:
+            self._embedding_cache_dir = Path(embedding_cache_dir) if embedding_cache_dir else (
+                _user_cache_dir("intent-cache")
+            )
 
-        logger.info(f"Loading sentence transformer model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        self.model: Optional["SentenceTransformer"] = None
+        self._onnx_session: Optional["onnxruntime.InferenceSession"] = None
+        if use_onnx:
+            if not ONNX_AVAILABLE:
+                raise ImportError(
+                    "use_onnx=True requires onnxruntime and tokenizers to be installed"
+                )
+            self._load_onnx_encoder(model_name, onnx_dir)
+        else:
+            if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                raise ImportError(
+                    "sentence-transformers is not installed; install it or pass use_onnx=True"
+                )
+            logger.info(f"Loading sentence transformer model: {model_name}")
+            self.model = SentenceTransformer(model_name)
+
+        # Writers (add_training_examples) serialize on the lock and publish a new
+        # _ScoringState in one assignment; classify never takes the lock
+        self._lock = threading.RLock()
+        prefixes = None if enabled_intent_prefixes is None else tuple(enabled_intent_prefixes)
+        self._examples: dict[Intent, list[str]] = {
+            intent: list(examples)
+            for intent, examples in INTENT_EXAMPLES.items()
+            if prefixes is None or intent.value.startswith(prefixes)
+        }
+        if not self._examples:
+            raise ValueError(f"No intent matches enabled_intent_prefixes {prefixes!r}")
 
         # Pre-compute embeddings for all intent examples
-        self._intent_embeddings: dict[Intent, np.ndarray] = {}
+        self._example_embeddings: dict[Intent, np.ndarray] = {}
         self._compute_intent_embeddings()
+        self._build_keyword_prefilter()
+
+        # Chat traffic is dominated by a few recurring messages ("bonjour", "merci")
+        self._keyword_scores = np.array([self.KEYWORD_CONFIDENCE], dtype=np.float32)
+        self._keyword_scores.flags.writeable = False
+        self._classify_cached = lru_cache(maxsize=cache_size)(self._classify_normalized)
+
+        # Ring buffer of recent query embeddings and their results
+        self.semantic_cache_threshold = semantic_cache_threshold
+        self._sem_cache_size = semantic_cache_size
+        self._sem_cache_lock = threading.Lock()
+        self._reset_semantic_cache()
 
-        logger.info(f"Intent classifier initialized with {len(INTENT_EXAMPLES)} intents")
+        logger.info(f"Intent classifier initialized with {len(self._examples)} intents")
 
     def _compute_intent_embeddings(self) -> None:
         """Pre-compute embeddings for all training examples"""
-        for intent, examples in INTENT_EXAMPLES.items():
-            embeddings = self.model.encode(examples, convert_to_numpy=True)
-            # Store mean embedding for each intent
-            self._intent_embeddings[intent] = np.mean(embeddings, axis=0)
+        # One forward pass over every example, then slice per intent
+        all_examples: list[str] = []
+        offsets = [0]
+        for examples in self._examples.values():
+            all_examples.extend(examples)
+            offsets.append(len(all_examples))
+
+        embeddings = self._load_or_encode_examples(all_examples)
+
+        for i, intent in enumerate(self._examples):
+            self._example_embeddings[intent] = embeddings[offsets[i]:offsets[i + 1]]
+        self._scoring = self._build_scoring_state()
+
+    def _load_or_encode_examples(self, all_examples: list[str]) -> np.ndarray:
+        """Encode the training examples, reusing the on-disk result of a previous run"""
+        if self._embedding_cache_dir is None:
+            return self._encode(all_examples)
+
+        # Any change to the model, the encoder backend or an example changes the key
+        payload = json.dumps(
+            {
+                "model": self.model_name,
+                "onnx": self._use_onnx,
+                "examples": {intent.value: examples for intent, examples in self._examples.items()},
+            },
+            sort_keys=True,
+        )
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        cache_path = self._embedding_cache_dir / f"intent_examples_{key}.npy"
+
+        try:
+            embeddings = np.load(cache_path)
+            if embeddings.shape[0] == len(all_examples):
+                logger.info(f"Loaded example embeddings from {cache_path}")
+                return embeddings
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache {cache_path}: {e}")
+
+        embeddings = self._encode(all_examples)
+        try:
+            self._embedding_cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # Write aside then rename, so concurrent workers never read a partial file
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as fh:
+                np.save(fh, embeddings)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write embedding cache {cache_path}: {e}")
+        return embeddings
+
+    def _build_keyword_prefilter(self) -> None:
+        """Compile the single-word examples of KEYWORD_INTENTS into one regex"""
+        keyword_intents: dict[str, Optional[Intent]] = {}
+        for intent, examples in self._examples.items():
+            for example in examples:
+                if " " in example:
+                    continue
+                keyword = example.lower()
+                # A keyword shared by several intents (or a non-keyword intent) is ambiguous
+                ambiguous = keyword_intents.get(keyword, intent) != intent
+                excluded = intent not in self.KEYWORD_INTENTS or keyword in self.KEYWORD_EXCLUDED
+                if excluded or ambiguous:
+                    keyword_intents[keyword] = None
+                else:
+                    keyword_intents[keyword] = intent
+
+        mapping = {k: i for k, i in keyword_intents.items() if i is not None}
+        if not mapping:
+            # An empty alternation would match the empty string at every word boundary
+            self._keywords = None
+            return
+        alternatives = sorted(map(re.escape, mapping), key=len, reverse=True)
+        # Regex and mapping are published together so a reader never sees a mismatched pair
+        self._keywords = (re.compile(r"\b(?:" + "|".join(alternatives) + r")\b"), mapping)
+
+    def _match_keywords(self, text: str) -> Optional[Intent]:
+        """Return the intent of a message made only of one intent's trigger words"""
+        if self._keywords is None:
+            return None
+        keyword_re, keyword_intents = self._keywords
+        hits = 0
+        found: Optional[Intent] = None
+        for match in keyword_re.finditer(text):
+            intent = keyword_intents[match.group(0)]
+            if found is not None and intent != found:
+                return None
+            found = intent
+            hits += 1
+
+        # Every word other than filler must be a trigger word ("au feu" yes, "feu d'artifice" no)
+        content_words = sum(1 for w in _WORD_RE.findall(text) if w not in _KEYWORD_STOPWORDS)
+        if found is None or hits < content_words:
+            return None
+        return found
+
+    def _load_onnx_encoder(self, model_name: str, onnx_dir: Optional[str]) -> None:
+        """Export the encoder to ONNX with dynamic int8 quantization, or reuse a previous export"""
+        save_dir = Path(onnx_dir) if onnx_dir else (
+            _user_cache_dir("intent-onnx") / model_name.replace("/", "--")
+        )
+        model_path = save_dir / "model_quantized.onnx"
+        tokenizer_path = save_dir / "tokenizer.json"
+
+        if not (model_path.exists() and tokenizer_path.exists()):
+            if not ONNX_EXPORT_AVAILABLE:
+                raise ImportError(
+                    f"No ONNX export in {save_dir}; exporting one requires optimum[onnxruntime]"
+                )
+            logger.info(f"Exporting {model_name} to quantized ONNX in {save_dir}")
+            save_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            ort_model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(ort_model)
+            quantizer.quantize(
+                save_dir=save_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(
+                    is_static=False, per_channel=False
+                ),
+            )
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(save_dir)
+
+        self._tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self._tokenizer.enable_truncation(max_length=self.ONNX_MAX_LENGTH)
+        pad_token = next(
+            (t for t in ("<pad>", "[PAD]") if self._tokenizer.token_to_id(t) is not None), None
+        )
+        if pad_token is not None:
+            self._tokenizer.enable_padding(
+                pad_id=self._tokenizer.token_to_id(pad_token), pad_token=pad_token
+            )
+        else:
+            self._tokenizer.enable_padding()
+        self._onnx_session = onnxruntime.InferenceSession(
+            str(model_path), providers=["CPUExecutionProvider"]
+        )
+        self._onnx_inputs = {node.name for node in self._onnx_session.get_inputs()}
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        """Encode texts into unit-length float32 rows"""
+        if self._onnx_session is None:
+            return self.model.encode(
+                texts,
+                batch_size=256,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+
+        encodings = self._tokenizer.encode_batch(texts)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        batch = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feed = {name: batch[name] for name in self._onnx_inputs if name in batch}
+        token_embeddings = self._onnx_session.run(None, feed)[0]
+
+        # Mean pooling over real tokens, as the sentence-transformers pipeline does
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return self._normalize_rows(pooled)
+
+    @staticmethod
+    def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+        """Return embeddings as a contiguous float32 matrix of unit-length rows"""
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        return matrix
+
+    def _build_scoring_state(self) -> _ScoringState:
+        """Stack every example embedding, grouped by intent, so scoring is one GEMV"""
+        intents = tuple(self._example_embeddings.keys())
+        sizes = [len(self._example_embeddings[intent]) for intent in intents]
+        intent_offsets = np.concatenate([[0], np.cumsum(sizes[:-1])]).astype(np.intp)
+        example_intent_ids = np.repeat(np.arange(len(intents), dtype=np.int32), sizes)
+        example_matrix = self._normalize_rows(
+            np.concatenate([self._example_embeddings[intent] for intent in intents])
+        )
+
+        matrix = example_matrix
+        row_scale = None
+        if self.matrix_dtype == "int8":
+            # Symmetric per-row quantization; scores are rescaled after the int32 dot
+            scale = 127.0 / np.abs(matrix).max(axis=1, keepdims=True)
+            matrix = np.round(matrix * scale).astype(np.int8)
+            row_scale = scale.squeeze(axis=1).astype(np.float32)
+        elif self.matrix_dtype == "float16":
+            matrix = matrix.astype(np.float16)
+
+        example_index = None
+        if FAISS_AVAILABLE:
+            example_index = faiss.IndexFlatIP(example_matrix.shape[1])
+            example_index.add(example_matrix)
+
+        return _ScoringState(
+            intents=intents,
+            labels=tuple(intent.value for intent in intents),
+            scoring_matrix=matrix,
+            row_scale=row_scale,
+            intent_offsets=intent_offsets,
+            example_intent_ids=example_intent_ids,
+            example_matrix=example_matrix,
+            example_index=example_index,
+        )
+
+    def _encode_query(self, text: str) -> np.ndarray:
+        """Encode text into a unit-length float32 vector"""
+        return self._encode([text])[0]
+
+    @staticmethod
+    def _intent_scores(state: _ScoringState, queries: np.ndarray) -> np.ndarray:
+        """
+        Score unit-length queries against every intent of state
+
+        An intent scores the cosine similarity of its closest example, so
+        intents with very different phrasings ("feu", "evacuation") are not
+        diluted into an average. queries is a single vector or a (batch, dim)
+        matrix; the result has one score per intent on its last axis.
+        """
+        if state.row_scale is None:
+            # float16 rows are upcast by the matmul, so accumulation stays in float32
+            similarities = np.matmul(queries, state.scoring_matrix.T, dtype=np.float32)
+        else:
+            query_scale = 127.0 / np.maximum(np.abs(queries).max(axis=-1, keepdims=True), 1e-12)
+            queries_i8 = np.round(queries * query_scale).astype(np.int8)
+            scores_i32 = np.matmul(queries_i8, state.scoring_matrix.T, dtype=np.int32)
+            similarities = scores_i32.astype(np.float32) / (state.row_scale * query_scale)
+
+        # Examples are grouped by intent: one segmented max gives every intent's score
+        return np.maximum.reduceat(similarities, state.intent_offsets, axis=-1)
+
+    def _reset_semantic_cache(self) -> None:
+        """Drop every cached near-duplicate query"""
+        dim = self._scoring.example_matrix.shape[1]
+        with self._sem_cache_lock:
+            self._sem_cache_emb = np.zeros((self._sem_cache_size, dim), dtype=np.float32)
+            self._sem_cache_results: list[Optional[IntentResult]] = [None] * self._sem_cache_size
+            self._sem_cache_head = 0
 
     def classify(self, text: str) -> IntentResult:
         """
@@ -412,22 +823,175 @@ class IntentClassifier:
                 requires_escalation=True,
             )
 
-        # Encode user message
-        user_embedding = self.model.encode(text, convert_to_numpy=True)
+        cached = self._classify_cached(text.strip().lower())
+        # Cached scores are read-only and shared; callers still get their own result
+        return replace(cached)
+
+    def _classify_normalized(self, text: str) -> IntentResult:
+        """Classify an already stripped and lowercased message"""
+        # Emergencies and small talk are recognized without running the encoder
+        keyword_intent = self._match_keywords(text)
+        if keyword_intent is not None:
+            return IntentResult(
+                intent=keyword_intent,
+                confidence=self.KEYWORD_CONFIDENCE,
+                all_scores=self._keyword_scores,
+                requires_escalation=False,
+                labels=(keyword_intent.value,),
+            )
 
-        # Calculate cosine similarity with each intent
-        scores: dict[str, float] = {}
-        for intent, intent_embedding in self._intent_embeddings.items():
-            similarity = self._cosine_similarity(user_embedding, intent_embedding)
-            scores[intent.value] = float(similarity)
+        state = self._scoring
+        query = self._encode_query(text)
 
-        # Find best matching intent
-        best_intent_value = max(scores, key=scores.get)  # type: ignore
-        best_score = scores[best_intent_value]
+        # Near-duplicate of a recent message: reuse its result
+        if self._sem_cache_size:
+            cache_similarities = self._sem_cache_emb @ query
+            cache_idx = int(cache_similarities.argmax())
+            if cache_similarities[cache_idx] >= self.semantic_cache_threshold:
+                # The slot may have been overwritten since the scan: re-check its embedding
+                # and read its result under the writer's lock so the pair is consistent
+                with self._sem_cache_lock:
+                    if self._sem_cache_emb[cache_idx] @ query >= self.semantic_cache_threshold:
+                        cached = self._sem_cache_results[cache_idx]
+                    else:
+                        cached = None
+                if cached is not None:
+                    return cached
 
-        # Convert to Intent enum
-        best_intent = Intent(best_intent_value)
+        # Cosine similarity with every intent in one GEMV
+        similarities = self._intent_scores(state, query)
+        best_idx = int(similarities.argmax())
+        best_score = float(similarities[best_idx])
+        best_intent = state.intents[best_idx]
+        similarities.flags.writeable = False
+        result = self._build_result(best_intent, best_score, similarities, state.labels)
+
+        if self._sem_cache_size:
+            # Only misses write here; the lock keeps each slot's embedding and result paired
+            with self._sem_cache_lock:
+                slot = self._sem_cache_head % self._sem_cache_size
+                self._sem_cache_emb[slot] = query
+                self._sem_cache_results[slot] = result
+                self._sem_cache_head += 1
+
+        return result
+
+    def classify_batch(self, texts: list[str]) -> list[IntentResult]:
+        """
+        Classify several user messages at once
+
+        Messages are encoded in one batched forward pass and scored against
+        every intent with a single matrix product, which amortizes the
+        per-call overhead when many messages arrive together.
+
+        Args:
+            texts: User messages to classify
 
+        Returns:
+            One IntentResult per message, in the same order
+        """
+        results: list[Optional[IntentResult]] = [None] * len(texts)
+        pending: list[int] = []
+        normalized: list[str] = []
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = IntentResult(
+                    intent=Intent.UNKNOWN,
+                    confidence=0.0,
+                    requires_escalation=True,
+                )
+                continue
+
+            message = text.strip().lower()
+            keyword_intent = self._match_keywords(message)
+            if keyword_intent is not None:
+                results[i] = IntentResult(
+                    intent=keyword_intent,
+                    confidence=self.KEYWORD_CONFIDENCE,
+                    all_scores=self._keyword_scores,
+                    requires_escalation=False,
+                    labels=(keyword_intent.value,),
+                )
+                continue
+
+            pending.append(i)
+            normalized.append(message)
+
+        if pending:
+            state = self._scoring
+            scores = self._intent_scores(state, self._encode(normalized))
+            scores.flags.writeable = False
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(pending)), best].tolist()
+            for row, (i, best_idx) in enumerate(zip(pending, best.tolist(), strict=True)):
+                results[i] = self._build_result(
+                    state.intents[best_idx], best_scores[row], scores[row], state.labels
+                )
+
+        return results  # type: ignore[return-value]
+
+    def classify_knn(self, text: str, k: int = 10) -> IntentResult:
+        """
+        Classify a user message by vote over its k nearest training examples
+
+        Where classify only looks at each intent's closest example, here the
+        k nearest examples overall vote, which smooths out a single outlier.
+        Neighbors vote with their similarity; the confidence is the best
+        similarity reached by the winning intent, so the usual thresholds apply.
+
+        Args:
+            text: User message to classify
+            k: Number of nearest examples taking part in the vote
+
+        Returns:
+            IntentResult whose all_scores holds each intent's share of the vote
+        """
+        if not text or not text.strip():
+            return IntentResult(
+                intent=Intent.UNKNOWN,
+                confidence=0.0,
+                requires_escalation=True,
+            )
+
+        state = self._scoring
+        similarities, neighbors = self._search_examples(state, self._encode_query(text), k)
+
+        # Similarity-weighted vote per intent; intents without a neighbor cannot win
+        neighbor_ids = state.example_intent_ids[neighbors]
+        n_intents = len(state.intents)
+        votes = np.bincount(neighbor_ids, weights=similarities, minlength=n_intents)
+        voted = np.bincount(neighbor_ids, minlength=n_intents) > 0
+        best_idx = int(np.where(voted, votes, -np.inf).argmax())
+        best_score = float(similarities[neighbor_ids == best_idx].max())
+
+        total = float(votes.sum()) or 1.0
+        scores = (votes / total).astype(np.float32)
+
+        return self._build_result(state.intents[best_idx], best_score, scores, state.labels)
+
+    @staticmethod
+    def _search_examples(
+        state: _ScoringState, query: np.ndarray, k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (similarities, example indices) of the k nearest examples, best first"""
+        k = min(k, len(state.example_intent_ids))
+        if state.example_index is not None:
+            distances, indices = state.example_index.search(query[None, :], k)
+            return distances[0], indices[0]
+
+        similarities = state.example_matrix @ query
+        top_idx = np.argpartition(-similarities, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-similarities[top_idx])]
+        return similarities[top_idx], top_idx
+
+    def _build_result(
+        self,
+        best_intent: Intent,
+        best_score: float,
+        scores: np.ndarray,
+        labels: tuple[str, ...],
+    ) -> IntentResult:
+        """Apply the confidence thresholds to the best match"""
         # Check if confidence is high enough
         if best_score < self.confidence_threshold:
             if best_score < self.fallback_threshold:
@@ -436,6 +1000,7 @@ class IntentClassifier:
                     confidence=best_score,
                     all_scores=scores,
                     requires_escalation=True,
+                    labels=labels,
                 )
             else:
                 # Low confidence but might be correct
@@ -444,6 +1009,7 @@ class IntentClassifier:
                     confidence=best_score,
                     all_scores=scores,
                     requires_escalation=False,
+                    labels=labels,
                 )
 
         return IntentResult(
@@ -451,6 +1017,7 @@ class IntentClassifier:
             confidence=best_score,
             all_scores=scores,
             requires_escalation=False,
+            labels=labels,
         )
 
     def classify_top_k(self, text: str, k: int = 3) -> list[IntentResult]:
@@ -464,21 +1031,20 @@ class IntentClassifier:
         Returns:
             List of top-k IntentResults
         """
-        user_embedding = self.model.encode(text, convert_to_numpy=True)
-
-        scores: list[tuple[Intent, float]] = []
-        for intent, intent_embedding in self._intent_embeddings.items():
-            similarity = self._cosine_similarity(user_embedding, intent_embedding)
-            scores.append((intent, float(similarity)))
+        state = self._scoring
+        similarities = self._intent_scores(state, self._encode_query(text))
 
-        # Sort by score descending
-        scores.sort(key=lambda x: x[1], reverse=True)
+        # Partial selection of the k best, then order only those
+        k = min(k, len(similarities))
+        top_idx = np.argpartition(-similarities, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-similarities[top_idx])]
 
         results = []
-        for intent, score in scores[:k]:
+        for idx in top_idx:
+            score = float(similarities[idx])
             results.append(
                 IntentResult(
-                    intent=intent,
+                    intent=state.intents[idx],
                     confidence=score,
                     requires_escalation=score < self.fallback_threshold,
                 )
@@ -486,11 +1052,6 @@ class IntentClassifier:
 
         return results
 
-    @staticmethod
-    def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors"""
-        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
-
     def add_training_examples(self, intent: Intent, examples: list[str]) -> None:
         """
         Add new training examples for an intent (runtime fine-tuning)
@@ -499,14 +1060,25 @@ class IntentClassifier:
             intent: Target intent
             examples: New example sentences
         """
-        if intent not in INTENT_EXAMPLES:
-            INTENT_EXAMPLES[intent] = []
+        if not examples:
+            return
+
+        with self._lock:
+            self._examples.setdefault(intent, []).extend(examples)
+
+            # Encode only the new examples and append them to the intent's block
+            new_embeddings = self._encode(list(examples))
+            previous = self._example_embeddings.get(intent)
+            self._example_embeddings[intent] = (
+                new_embeddings if previous is None else np.concatenate([previous, new_embeddings])
+            )
 
-        INTENT_EXAMPLES[intent].extend(examples)
+            # Build the new state aside (a FAISS index is not safe to grow while
+            # being searched), then publish it in a single assignment
+            self._scoring = self._build_scoring_state()
 
-        # Recompute embedding for this intent
-        all_examples = INTENT_EXAMPLES[intent]
-        embeddings = self.model.encode(all_examples, convert_to_numpy=True)
-        self._intent_embeddings[intent] = np.mean(embeddings, axis=0)
+            self._build_keyword_prefilter()
+            self._classify_cached.cache_clear()
+            self._reset_semantic_cache()
 
         logger.info(f"Added {len(examples)} examples for intent {intent.value}")
@@ -17,10 +17,11 @@ Models:
 GDPR: All data is anonymized before training
 """
 
+import asyncio
 import logging
 import pickle
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import UTC, datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -45,6 +46,84 @@ except ImportError:
     TF_AVAILABLE = False
     logger.warning("TensorFlow not available, autoencoder disabled")
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _window_totals(
+        times: np.ndarray, amounts: np.ndarray, now: float
+    ) -> Tuple[int, int, float, float]:
+        """Transaction count and amount over the last hour and day (times in epoch seconds)."""
+        count_1h = 0
+        count_24h = 0
+        amount_1h = 0.0
+        amount_24h = 0.0
+        hour_ago = now - 3600.0
+        day_ago = now - 86400.0
+        for i in range(times.shape[0]):
+            if times[i] > day_ago:
+                count_24h += 1
+                amount_24h += amounts[i]
+                if times[i] > hour_ago:
+                    count_1h += 1
+                    amount_1h += amounts[i]
+        return count_1h, count_24h, amount_1h, amount_24h
+
+    @njit(cache=True, fastmath=True)
+    def _mean_std(values: np.ndarray) -> Tuple[float, float]:
+        """Population mean and standard deviation in two passes."""
+        n = values.shape[0]
+        if n == 0:
+            return 0.0, 0.0
+        total = 0.0
+        for i in range(n):
+            total += values[i]
+        mean = total / n
+        sq = 0.0
+        for i in range(n):
+            sq += (values[i] - mean) ** 2
+        return mean, (sq / n) ** 0.5
+
+else:
+    # Without numba the loops above would run interpreted over numpy scalars;
+    # masked numpy reductions are the fast path instead
+    def _window_totals(
+        times: np.ndarray, amounts: np.ndarray, now: float
+    ) -> Tuple[int, int, float, float]:
+        """Transaction count and amount over the last hour and day (times in epoch seconds)."""
+        in_1h = times > now - 3600.0
+        in_24h = times > now - 86400.0
+        return (
+            int(np.count_nonzero(in_1h)),
+            int(np.count_nonzero(in_24h)),
+            float(amounts.sum(where=in_1h)),
+            float(amounts.sum(where=in_24h)),
+        )
+
+    def _mean_std(values: np.ndarray) -> Tuple[float, float]:
+        """Population mean and standard deviation (same values as np.mean/np.std)."""
+        n = values.shape[0]
+        if n == 0:
+            return 0.0, 0.0
+        mean = values.sum() / n
+        deviations = values - mean
+        return float(mean), float((deviations @ deviations / n) ** 0.5)
+
+
+_EMPTY_HISTORY = np.empty(0, dtype=np.float64)
+
+
+def _epoch(ts: datetime) -> float:
+    """Epoch seconds; naive timestamps are UTC like datetime.utcnow()."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return ts.timestamp()
+
 
 class AnomalyType(Enum):
     """Types of anomalies that can be detected."""
@@ -66,6 +145,10 @@ class AnomalyResult:
     details: Dict[str, Any] = field(default_factory=dict)
 
 
+# Length of FeatureVector.to_array()
+N_FEATURES = 18
+
+
 @dataclass
 class FeatureVector:
     """Feature vector for ML models."""
@@ -98,8 +181,14 @@ class FeatureVector:
     distance_from_usual: float
 
     def to_array(self) -> np.ndarray:
-        """Convert to numpy array for ML models."""
-        return np.array([
+        """Convert to float32 numpy array for ML models."""
+        out = np.empty(N_FEATURES, dtype=np.float32)
+        self.write_to(out)
+        return out
+
+    def write_to(self, out: np.ndarray) -> None:
+        """Write the normalized features into an existing row of length N_FEATURES."""
+        out[:] = (
             self.amount,
             self.amount_zscore,
             float(self.is_round_amount),
@@ -118,7 +207,7 @@ class FeatureVector:
             float(self.is_new_device),
             float(self.is_new_location),
             min(self.distance_from_usual / 100.0, 1.0),  # km
-        ])
+        )
 
 
 class IsolationForestDetector:
@@ -170,20 +259,22 @@ class IsolationForestDetector:
 
         logger.info(f"Training Isolation Forest on {X.shape[0]} samples...")
 
-        # Scale features
-        self.scaler = RobustScaler()
-        X_scaled = self.scaler.fit_transform(X)
+        # Fit into locals and swap in at the end: training may run in a worker
+        # thread while predict() serves requests with the previous model
+        scaler = RobustScaler()
+        X_scaled = scaler.fit_transform(X)
 
         # Train model
-        self.model = IsolationForest(
+        model = IsolationForest(
             contamination=self.contamination,
             n_estimators=self.n_estimators,
             max_samples=min(self.max_samples, X.shape[0]),
             random_state=self.random_state,
             n_jobs=-1,  # Use all CPU cores
         )
-        self.model.fit(X_scaled)
+        model.fit(X_scaled)
 
+        self.scaler, self.model = scaler, model
         self._is_trained = True
 
         # Calculate training metrics
@@ -224,8 +315,10 @@ class IsolationForestDetector:
         # Convert to anomaly flags (-1 = anomaly, 1 = normal)
         is_anomaly = predictions == -1
 
-        # Normalize scores to 0-1 range (higher = more anomalous)
-        normalized_scores = 1 - (scores - scores.min()) / (scores.max() - scores.min() + 1e-10)
+        # score_samples is the negated anomaly score of the original paper, already in
+        # (0, 1] with higher = more anomalous; using it directly keeps each row's
+        # score independent of the rest of the batch
+        normalized_scores = np.clip(-scores, 0.0, 1.0)
 
         return is_anomaly, normalized_scores
 
@@ -345,12 +438,12 @@ class AutoencoderDetector:
 
         logger.info(f"Training Autoencoder on {X.shape[0]} samples...")
 
-        # Scale features
-        self.scaler = StandardScaler()
-        X_scaled = self.scaler.fit_transform(X)
+        # Scale features (published with the model once training is done)
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
 
         # Build and train model
-        self.model = self._build_model()
+        model = self._build_model()
 
         # Early stopping to prevent overfitting
         early_stop = keras.callbacks.EarlyStopping(
@@ -359,7 +452,7 @@ class AutoencoderDetector:
             restore_best_weights=True,
         )
 
-        history = self.model.fit(
+        history = model.fit(
             X_scaled, X_scaled,
             epochs=epochs,
             batch_size=batch_size,
@@ -369,10 +462,11 @@ class AutoencoderDetector:
         )
 
         # Calculate reconstruction errors and threshold
-        reconstructions = self.model.predict(X_scaled, verbose=0)
+        reconstructions = model.predict(X_scaled, verbose=0)
         mse = np.mean(np.power(X_scaled - reconstructions, 2), axis=1)
-        self.threshold = np.percentile(mse, self.threshold_percentile)
 
+        self.scaler, self.model = scaler, model
+        self.threshold = np.percentile(mse, self.threshold_percentile)
         self._is_trained = True
 
         metrics = {
@@ -409,9 +503,8 @@ class AutoencoderDetector:
 
         is_anomaly = mse > self.threshold
 
-        # Normalize scores to 0-1 range
-        max_mse = max(self.threshold * 3, mse.max())
-        normalized_scores = np.clip(mse / max_mse, 0, 1)
+        # Normalize scores to 0-1 range, saturating at 3x the threshold per row
+        normalized_scores = np.clip(mse / (self.threshold * 3), 0, 1)
 
         return is_anomaly, normalized_scores
 
@@ -483,11 +576,14 @@ class AnomalyDetector:
             encoding_dim=self.config.get('ae_encoding_dim', 8),
         )
 
+        # Reused feature matrix for detect_batch; grown if a batch is larger
+        self._feature_buf = np.empty((64, N_FEATURES), dtype=np.float32)
+
         # User statistics cache for feature engineering
         self._user_stats: Dict[str, Dict[str, Any]] = {}
 
-        # Transaction history cache
-        self._tx_history: Dict[str, List[Dict[str, Any]]] = {}
+        # Transaction history cache: (epoch seconds, amounts) per user, last 100
+        self._tx_history: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
 
         # Global statistics for z-score calculation
         self._global_stats = {
@@ -511,6 +607,11 @@ class AnomalyDetector:
             except Exception as e:
                 logger.warning(f"Could not load models: {e}")
 
+        if NUMBA_AVAILABLE:
+            # Compile the numeric kernels now rather than on the first transaction
+            _window_totals(np.zeros(1), np.zeros(1), 0.0)
+            _mean_std(np.zeros(1))
+
         self._initialized = True
         logger.info("Anomaly Detector initialized")
 
@@ -524,27 +625,75 @@ class AnomalyDetector:
         Returns:
             AnomalyResult with scores and anomaly types
         """
-        # Extract features
-        features = self._extract_features(transaction)
-        feature_array = features.to_array().reshape(1, -1)
-
-        anomaly_types = []
-        scores = {}
-
-        # Run Isolation Forest
-        if self.isolation_forest._is_trained:
-            if_anomaly, if_scores = self.isolation_forest.predict(feature_array)
-            scores['isolation_forest'] = float(if_scores[0])
-            if if_anomaly[0]:
-                anomaly_types.append(AnomalyType.PATTERN)
-
-        # Run Autoencoder (if trained)
-        if self.autoencoder._is_trained:
-            ae_anomaly, ae_scores = self.autoencoder.predict(feature_array)
-            scores['autoencoder'] = float(ae_scores[0])
-            if ae_anomaly[0]:
-                anomaly_types.append(AnomalyType.BEHAVIORAL)
+        return (await self.detect_batch([transaction]))[0]
+
+    async def detect_batch(self, transactions: List[Any]) -> List[AnomalyResult]:
+        """
+        Detect anomalies in several transactions with one model call per detector.
+
+        Features are extracted in order, updating history after each transaction,
+        so results match calling detect() on them one by one.
 
+        Args:
+            transactions: TransactionData objects
+
+        Returns:
+            One AnomalyResult per transaction, in the same order
+        """
+        features_list = []
+        for transaction in transactions:
+            features_list.append(self._extract_features(transaction))
+            self._update_history(transaction)
+
+        if not features_list:
+            return []
+
+        n = len(features_list)
+        if_anomaly = ae_anomaly = None
+        if self.isolation_forest._is_trained or self.autoencoder._is_trained:
+            # float32 rows: half the bandwidth, and what sklearn trees and Keras use anyway.
+            # Filled in place; nothing awaits before the models are done with it.
+            if n > self._feature_buf.shape[0]:
+                self._feature_buf = np.empty((n, N_FEATURES), dtype=np.float32)
+            feature_matrix = self._feature_buf[:n]
+            for row, features in zip(feature_matrix, features_list, strict=True):
+                features.write_to(row)
+
+            # Run Isolation Forest
+            if self.isolation_forest._is_trained:
+                if_anomaly, if_scores = self.isolation_forest.predict(feature_matrix)
+
+            # Run Autoencoder (if trained)
+            if self.autoencoder._is_trained:
+                ae_anomaly, ae_scores = self.autoencoder.predict(feature_matrix)
+
+        results = []
+        for i in range(n):
+            features = features_list[i]
+            anomaly_types = []
+            scores = {}
+
+            if if_anomaly is not None:
+                scores['isolation_forest'] = float(if_scores[i])
+                if if_anomaly[i]:
+                    anomaly_types.append(AnomalyType.PATTERN)
+
+            if ae_anomaly is not None:
+                scores['autoencoder'] = float(ae_scores[i])
+                if ae_anomaly[i]:
+                    anomaly_types.append(AnomalyType.BEHAVIORAL)
+
+            results.append(self._finish_result(features, scores, anomaly_types))
+
+        return results
+
+    def _finish_result(
+        self,
+        features: FeatureVector,
+        scores: Dict[str, float],
+        anomaly_types: List[AnomalyType],
+    ) -> AnomalyResult:
+        """Add the statistical checks to the model scores and build the result."""
         # Statistical checks
         stat_anomalies = self._statistical_checks(features)
         anomaly_types.extend(stat_anomalies)
@@ -574,9 +723,6 @@ class AnomalyDetector:
         # Calculate confidence
         confidence = min(1.0, len(scores) / 5.0)  # More signals = higher confidence
 
-        # Update transaction history
-        self._update_history(transaction)
-
         return AnomalyResult(
             is_anomaly=is_anomaly,
             scores=scores,
@@ -595,7 +741,7 @@ class AnomalyDetector:
         timestamp = transaction.timestamp
 
         # Get user history
-        user_txs = self._tx_history.get(user_id, [])
+        tx_times, tx_amounts = self._tx_history.get(user_id, (_EMPTY_HISTORY, _EMPTY_HISTORY))
         user_stats = self._user_stats.get(user_id, {})
 
         # Calculate temporal features
@@ -605,27 +751,16 @@ class AnomalyDetector:
         is_night = hour >= 22 or hour < 6
 
         # Calculate time since last transaction
-        if user_txs:
-            last_tx_time = user_txs[-1].get('timestamp', timestamp)
-            if isinstance(last_tx_time, str):
-                last_tx_time = datetime.fromisoformat(last_tx_time)
-            minutes_since_last = (timestamp - last_tx_time).total_seconds() / 60
+        now = _epoch(timestamp)
+        if tx_times.size:
+            minutes_since_last = (now - tx_times[-1]) / 60
         else:
             minutes_since_last = 999999  # First transaction
 
         # Calculate velocity features
-        one_hour_ago = timestamp - timedelta(hours=1)
-        one_day_ago = timestamp - timedelta(days=1)
-
-        recent_1h = [tx for tx in user_txs
-                    if tx.get('timestamp', datetime.min) > one_hour_ago]
-        recent_24h = [tx for tx in user_txs
-                     if tx.get('timestamp', datetime.min) > one_day_ago]
-
-        tx_count_1h = len(recent_1h)
-        tx_count_24h = len(recent_24h)
-        total_amount_1h = sum(tx.get('amount', 0) for tx in recent_1h)
-        total_amount_24h = sum(tx.get('amount', 0) for tx in recent_24h)
+        tx_count_1h, tx_count_24h, total_amount_1h, total_amount_24h = _window_totals(
+            tx_times, tx_amounts, now
+        )
 
         # Calculate user behavior features
         avg_tx_amount = user_stats.get('avg_amount', amount)
@@ -767,7 +902,7 @@ class AnomalyDetector:
 
         # Initialize if needed
         if user_id not in self._tx_history:
-            self._tx_history[user_id] = []
+            self._tx_history[user_id] = (_EMPTY_HISTORY, _EMPTY_HISTORY)
             self._user_stats[user_id] = {
                 'avg_amount': 0,
                 'std_amount': 0,
@@ -775,20 +910,16 @@ class AnomalyDetector:
                 'known_devices': set(),
             }
 
-        # Add transaction
-        self._tx_history[user_id].append({
-            'timestamp': transaction.timestamp,
-            'amount': transaction.amount or 0,
-            'type': transaction.transaction_type,
-        })
-
-        # Keep only last 100 transactions
-        self._tx_history[user_id] = self._tx_history[user_id][-100:]
+        # Add transaction, keeping only the last 100
+        tx_times, tx_amounts = self._tx_history[user_id]
+        tx_times = np.append(tx_times[-99:], _epoch(transaction.timestamp))
+        tx_amounts = np.append(tx_amounts[-99:], float(transaction.amount or 0))
+        self._tx_history[user_id] = (tx_times, tx_amounts)
 
         # Update user stats
-        amounts = [tx['amount'] for tx in self._tx_history[user_id]]
-        self._user_stats[user_id]['avg_amount'] = np.mean(amounts)
-        self._user_stats[user_id]['std_amount'] = np.std(amounts)
+        avg_amount, std_amount = _mean_std(tx_amounts)
+        self._user_stats[user_id]['avg_amount'] = avg_amount
+        self._user_stats[user_id]['std_amount'] = std_amount
 
         if transaction.device_id:
             self._user_stats[user_id]['known_devices'].add(transaction.device_id)
@@ -810,19 +941,23 @@ class AnomalyDetector:
 
         # Convert to feature arrays
         # In production, this would use the actual feature extraction
-        n_features = 18
-        X = np.random.randn(len(training_data), n_features)  # Placeholder
+        n_features = N_FEATURES
+        X = np.random.randn(len(training_data), n_features).astype(np.float32)  # Placeholder
 
         # For real implementation:
         # features = [self._extract_features_from_dict(d) for d in training_data]
         # X = np.array([f.to_array() for f in features])
 
-        # Train models
-        if_metrics = self.isolation_forest.train(X)
-
-        ae_metrics = {'status': 'skipped'}
+        # Train both models concurrently in worker threads; the sklearn and
+        # TensorFlow fits release the GIL, and detection keeps running meanwhile
         if TF_AVAILABLE:
-            ae_metrics = self.autoencoder.train(X)
+            if_metrics, ae_metrics = await asyncio.gather(
+                asyncio.to_thread(self.isolation_forest.train, X),
+                asyncio.to_thread(self.autoencoder.train, X),
+            )
+        else:
+            if_metrics = await asyncio.to_thread(self.isolation_forest.train, X)
+            ae_metrics = {'status': 'skipped'}
 
         # Update global statistics from training data
         amounts = [d.get('amount', 0) for d in training_data]
@@ -16,14 +16,20 @@ GDPR Compliance: All training data is anonymized
 """
 
 import asyncio
+import bisect
 import hashlib
 import logging
+import sys
 import time
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import UTC, datetime
 from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
+from cachetools import TTLCache
 
 from .anomaly_detection import AnomalyDetector, AnomalyType
 from .pattern_recognition import PatternRecognizer, FraudPattern
@@ -32,6 +38,27 @@ from .risk_scorer import RiskScorer, RiskLevel
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8192)
+def _gdpr_hash(value: str) -> str:
+    """16 hex chars of BLAKE2b; cached since the same IDs recur in bursts."""
+    return hashlib.blake2b(value.encode('utf-8', 'ignore'), digest_size=8).hexdigest()
+
+
+def _to_epoch(ts: datetime) -> float:
+    """Epoch seconds of a timestamp; naive timestamps are UTC like datetime.utcnow()."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return ts.timestamp()
+
+
+def _from_epoch(ts: float) -> datetime:
+    """Naive UTC datetime for an epoch timestamp."""
+    return datetime.fromtimestamp(ts, tz=UTC).replace(tzinfo=None)
+
+
+_alert_time = attrgetter('timestamp')
+
+
 class FraudType(Enum):
     """Types of fraud that can be detected."""
     DUPLICATE_TICKET = "duplicate_ticket"
@@ -46,6 +73,20 @@ class FraudType(Enum):
     PAYMENT_FRAUD = "payment_fraud"
 
 
+# One bit per fraud type, so collected types are deduplicated with an int mask
+_FT_BIT = {ft: 1 << i for i, ft in enumerate(FraudType)}
+
+
+def _merge_fraud_types(fraud_types: List[FraudType], fraud_mask: int, new_types) -> int:
+    """Append types not yet in the mask to fraud_types, in order; return the new mask."""
+    for ft in new_types:
+        bit = _FT_BIT[ft]
+        if not fraud_mask & bit:
+            fraud_mask |= bit
+            fraud_types.append(ft)
+    return fraud_mask
+
+
 class FraudAction(Enum):
     """Actions to take when fraud is detected."""
     ALLOW = "allow"
@@ -55,7 +96,13 @@ class FraudAction(Enum):
     ALERT_SECURITY = "alert_security"
 
 
-@dataclass
+# Interned enum values, looked up directly instead of through Enum.value
+_FT_VALUES = {ft: sys.intern(ft.value) for ft in FraudType}
+_FA_VALUES = {fa: sys.intern(fa.value) for fa in FraudAction}
+_AT_VALUES = {at: sys.intern(at.value) for at in AnomalyType}
+
+
+@dataclass(slots=True)
 class FraudCheckResult:
     """Result of a fraud check."""
     transaction_id: str
@@ -72,7 +119,7 @@ class FraudCheckResult:
     recommendations: List[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class TransactionData:
     """Input data for fraud check."""
     transaction_id: str
@@ -105,8 +152,14 @@ class TransactionData:
     # Additional context
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    # Epoch seconds of timestamp; the checks compare floats instead of datetimes
+    ts_epoch: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.ts_epoch = _to_epoch(self.timestamp)
 
-@dataclass
+
+@dataclass(slots=True)
 class FraudAlert:
     """Alert generated for security team."""
     alert_id: str
@@ -123,6 +176,17 @@ class FraudAlert:
     auto_blocked: bool
 
 
+@dataclass(slots=True)
+class _CacheLookup:
+    """Cached context for one transaction, from Redis or the in-process caches."""
+    last_scan: Optional[Tuple[float, Optional[str]]] = None  # (epoch seconds, zone)
+    scan_count: int = 0
+    device_user_count: int = 0
+    ip_user_count: int = 0
+    tx_count_1h: int = 0
+    tx_count_5min: int = 0
+
+
 class FraudDetector:
     """
     Main fraud detection orchestrator.
@@ -148,9 +212,56 @@ class FraudDetector:
     THRESHOLD_BLOCK = 75.0
     THRESHOLD_ALERT = 60.0
 
+    # Fast path: every anomaly score must sit below its cutoff, on each score's own
+    # scale. isolation_forest is the paper's anomaly score, ~0.5 at sklearn's decision
+    # boundary with inliers around 0.4-0.5; autoencoder reaches 1/3 at its
+    # reconstruction-error threshold; the statistical scores first step up at 0.3.
+    FAST_PATH_SCORE_CUTOFFS = {
+        'isolation_forest': 0.5,
+        'autoencoder': 1 / 3,
+        'amount': 0.3,
+        'velocity': 0.3,
+        'timing': 0.3,
+    }
+    # The fast path needs at least one trained model to have scored the transaction
+    _MODEL_SCORES = frozenset(('isolation_forest', 'autoencoder'))
+
     # Performance target
     MAX_PROCESSING_TIME_MS = 100.0
 
+    # Cache windows; the key prefix namespaces the shared Redis state
+    REDIS_KEY_PREFIX = "fraud:"
+    TICKET_SCAN_WINDOW_S = 4 * 3600
+    VELOCITY_WINDOW_S = 3600
+    BURST_WINDOW_S = 300
+    ACCOUNT_LINK_TTL_S = 24 * 3600
+
+    # Bounds on the in-process caches
+    LOCAL_CACHE_MAXSIZE = 100_000
+    RECENT_SCANS_KEPT = 10
+
+    # Alerts are dispatched off the request path by a small worker pool
+    ALERT_QUEUE_MAXSIZE = 10_000
+    ALERT_WORKERS = 4
+
+    # Concurrent anomaly checks are coalesced into one model call per batch
+    BATCH_WINDOW_MS = 3.0
+    BATCH_SIZE = 64
+
+    # Fraud types that always trigger a block
+    _CRITICAL_TYPES = frozenset({
+        FraudType.DUPLICATE_TICKET,
+        FraudType.FALSIFIED_TICKET,
+        FraudType.PAYMENT_FRAUD,
+    })
+    _CRITICAL_MASK = sum(map(_FT_BIT.get, _CRITICAL_TYPES))
+
+    # Evidence fields hashed before alerts leave the detector
+    _SENSITIVE = frozenset(('ip_address', 'device_fingerprint', 'user_id', 'device_id'))
+
+    # Display names for alert descriptions
+    _PRETTY = {ft: _FT_VALUES[ft].replace('_', ' ').title() for ft in FraudType}
+
     def __init__(
         self,
         config: Optional[Dict[str, Any]] = None,
@@ -166,6 +277,8 @@ class FraudDetector:
             db_client: Database client for historical data
         """
         self.config = config or {}
+        # Async client (redis.asyncio); when set, the caches below live in Redis and
+        # are shared by every worker, with windows trimmed server-side
         self.redis = redis_client
         self.db = db_client
 
@@ -174,14 +287,39 @@ class FraudDetector:
         self.pattern_recognizer = PatternRecognizer(config=self.config.get('patterns', {}))
         self.risk_scorer = RiskScorer(config=self.config.get('scoring', {}))
 
-        # Caches for fast lookups
-        self._ticket_scan_cache: Dict[str, List[Tuple[datetime, str]]] = {}
-        self._user_transaction_cache: Dict[str, List[datetime]] = {}
-        self._device_user_cache: Dict[str, set] = {}
-        self._ip_user_cache: Dict[str, set] = {}
+        # In-process caches for fast lookups (used without Redis); size- and
+        # TTL-bounded so a multi-day event doesn't grow them without limit
+        self._ticket_scan_cache: TTLCache = TTLCache(
+            maxsize=self.LOCAL_CACHE_MAXSIZE, ttl=self.ACCOUNT_LINK_TTL_S
+        )
+        # Epoch seconds of each user's recent transactions, oldest first
+        self._user_transaction_cache: TTLCache = TTLCache(
+            maxsize=self.LOCAL_CACHE_MAXSIZE, ttl=self.ACCOUNT_LINK_TTL_S
+        )
+        self._device_user_cache: TTLCache = TTLCache(
+            maxsize=self.LOCAL_CACHE_MAXSIZE, ttl=self.ACCOUNT_LINK_TTL_S
+        )
+        self._ip_user_cache: TTLCache = TTLCache(
+            maxsize=self.LOCAL_CACHE_MAXSIZE, ttl=self.ACCOUNT_LINK_TTL_S
+        )
 
-        # Alerts queue
+        # Alerts queue, oldest first, plus the same ordering per severity
         self._alerts: List[FraudAlert] = []
+        self._alerts_by_severity: Dict[str, List[FraudAlert]] = defaultdict(list)
+        self._alert_queue: asyncio.Queue = asyncio.Queue(maxsize=self.ALERT_QUEUE_MAXSIZE)
+        self._alert_workers: List[asyncio.Task] = []
+
+        # Cache-only checks run by _sync_checks, bound once rather than per transaction
+        self._sync_check_fns = (
+            self._check_ticket_fraud,
+            self._check_multiple_accounts,
+            self._check_velocity,
+            self._check_geolocation,
+        )
+
+        # Pending anomaly checks: (transaction, future for its AnomalyResult)
+        self._batch_q: asyncio.Queue = asyncio.Queue()
+        self._batch_task: Optional[asyncio.Task] = None
 
         # Statistics
         self._stats = {
@@ -189,7 +327,8 @@ class FraudDetector:
             'blocked': 0,
             'flagged': 0,
             'alerts_generated': 0,
-            'avg_processing_time_ms': 0.0,
+            'fast_path': 0,
+            'total_processing_time_ms': 0.0,
         }
 
         self._initialized = False
@@ -207,6 +346,13 @@ class FraudDetector:
         if self.db:
             await self._load_historical_data()
 
+        if not self._alert_workers:
+            self._alert_workers = [
+                asyncio.create_task(self._alert_worker()) for _ in range(self.ALERT_WORKERS)
+            ]
+        if self._batch_task is None:
+            self._batch_task = asyncio.create_task(self._anomaly_batcher())
+
         self._initialized = True
         logger.info("Fraud Detector initialized successfully")
 
@@ -233,58 +379,84 @@ class FraudDetector:
 
         start_time = time.perf_counter()
         fraud_types: List[FraudType] = []
+        fraud_mask = 0
         details: Dict[str, Any] = {}
 
         try:
-            # Run all checks in parallel for speed
-            check_tasks = [
-                self._check_ticket_fraud(data),
-                self._check_transaction_anomalies(data),
-                self._check_multiple_accounts(data),
-                self._check_velocity(data),
-                self._check_geolocation(data),
-            ]
-
-            results = await asyncio.gather(*check_tasks, return_exceptions=True)
-
-            # Process results
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    logger.error(f"Check {i} failed: {result}")
-                    continue
-
-                check_fraud_types, check_details = result
-                fraud_types.extend(check_fraud_types)
-                details.update(check_details)
-
-            # Pattern recognition
-            patterns = await self.pattern_recognizer.recognize_patterns(data, details)
-            for pattern in patterns:
-                if pattern.fraud_type not in fraud_types:
-                    fraud_types.append(pattern.fraud_type)
-                details[f'pattern_{pattern.name}'] = {
-                    'confidence': pattern.confidence,
-                    'evidence': pattern.evidence,
-                }
-
-            # Calculate risk score
-            risk_result = await self.risk_scorer.calculate_score(
-                data=data,
-                fraud_types=fraud_types,
-                anomaly_scores=details.get('anomaly_scores', {}),
-                pattern_matches=patterns,
-            )
+            # Only the ML detector and the Redis round trip actually wait on
+            # something; the cache-only checks then run inline in one pass
+            if self.redis is not None:
+                anomaly_check, lookup = await asyncio.gather(
+                    self._check_transaction_anomalies(data),
+                    self._redis_pipeline(data),
+                    return_exceptions=True,
+                )
+            else:
+                lookup = self._local_lookup(data)
+                try:
+                    anomaly_check = await self._check_transaction_anomalies(data)
+                except Exception as e:
+                    anomaly_check = e
+
+            if isinstance(anomaly_check, Exception):
+                logger.error("Anomaly check failed: %s", anomaly_check)
+            else:
+                fraud_mask = _merge_fraud_types(fraud_types, fraud_mask, anomaly_check[0])
+                details.update(anomaly_check[1])
+
+            if isinstance(lookup, Exception):
+                logger.error("Cache lookup failed: %s", lookup)
+                lookup = _CacheLookup()
+
+            check_fraud_types, check_details = self._sync_checks(data, lookup)
+            fraud_mask = _merge_fraud_types(fraud_types, fraud_mask, check_fraud_types)
+            details.update(check_details)
+
+            # Fast path: nothing flagged and the ML models scored every anomaly
+            # low, so skip pattern recognition and full risk scoring
+            anomaly_scores = details.get('anomaly_scores', {})
+            preliminary_score = None
+            if not fraud_mask and not isinstance(anomaly_check, Exception):
+                preliminary_score = self._fast_path_score(anomaly_scores)
+            fast_path = preliminary_score is not None
+
+            if fast_path:
+                risk_score, risk_level = preliminary_score, RiskLevel.LOW
+                confidence = details.get('anomaly_confidence', 0.0)
+            else:
+                # Pattern recognition
+                patterns = await self.pattern_recognizer.recognize_patterns(data, details)
+                for pattern in patterns:
+                    # Patterns use pattern_recognition's own FraudType enum
+                    fraud_mask = _merge_fraud_types(
+                        fraud_types, fraud_mask, (FraudType(pattern.fraud_type.value),)
+                    )
+                    details[f'pattern_{pattern.name}'] = {
+                        'confidence': pattern.confidence,
+                        'evidence': pattern.evidence,
+                    }
+
+                # Calculate risk score
+                risk_result = await self.risk_scorer.calculate_score(
+                    data=data,
+                    fraud_types=fraud_types,
+                    anomaly_scores=anomaly_scores,
+                    pattern_matches=patterns,
+                )
+                risk_score = risk_result.score
+                risk_level = risk_result.level
+                confidence = risk_result.confidence
 
             # Determine action
             action, should_block, alert_required = self._determine_action(
-                risk_result.score,
-                fraud_types,
+                risk_score,
+                fraud_mask,
             )
 
             # Generate recommendations
             recommendations = self._generate_recommendations(
                 fraud_types,
-                risk_result.score,
+                risk_score,
                 details,
             )
 
@@ -295,11 +467,11 @@ class FraudDetector:
             result = FraudCheckResult(
                 transaction_id=data.transaction_id,
                 timestamp=datetime.utcnow(),
-                risk_score=risk_result.score,
-                risk_level=risk_result.level,
+                risk_score=risk_score,
+                risk_level=risk_level,
                 fraud_types=fraud_types,
                 action=action,
-                confidence=risk_result.confidence,
+                confidence=confidence,
                 details=details,
                 processing_time_ms=processing_time_ms,
                 should_block=should_block,
@@ -309,22 +481,29 @@ class FraudDetector:
 
             # Update statistics
             self._update_stats(result)
+            if fast_path:
+                self._stats['fast_path'] += 1
 
-            # Generate alert if needed
+            # Generate alert if needed (in the background; inline if the queue is full)
             if alert_required:
-                await self._generate_alert(data, result)
+                try:
+                    self._alert_queue.put_nowait((data, result))
+                except asyncio.QueueFull:
+                    logger.warning("Alert queue full, generating alert inline")
+                    await self._generate_alert(data, result)
 
             # Log performance warning if too slow
             if processing_time_ms > self.MAX_PROCESSING_TIME_MS:
                 logger.warning(
-                    f"Fraud check exceeded time limit: {processing_time_ms:.2f}ms "
-                    f"(target: {self.MAX_PROCESSING_TIME_MS}ms)"
+                    "Fraud check exceeded time limit: %.2fms (target: %sms)",
+                    processing_time_ms,
+                    self.MAX_PROCESSING_TIME_MS,
                 )
 
             return result
 
         except Exception as e:
-            logger.error(f"Fraud check failed: {e}")
+            logger.error("Fraud check failed: %s", e)
             # Return safe default on error
             return FraudCheckResult(
                 transaction_id=data.transaction_id,
@@ -341,9 +520,148 @@ class FraudDetector:
                 recommendations=['Error during check - manual review recommended'],
             )
 
-    async def _check_ticket_fraud(
+    def _local_lookup(self, data: TransactionData) -> _CacheLookup:
+        """Read and update the in-process scan, account-link and velocity caches."""
+        lookup = _CacheLookup()
+
+        if data.transaction_type == 'ticket_scan' and data.ticket_id:
+            cache_key = f"ticket:{data.ticket_id}"
+            recent_scans = self._ticket_scan_cache.setdefault(
+                cache_key, deque(maxlen=self.RECENT_SCANS_KEPT)
+            )
+
+            # Drop scans older than 4 hours
+            cutoff = time.time() - self.TICKET_SCAN_WINDOW_S
+            while recent_scans and recent_scans[0][0] <= cutoff:
+                recent_scans.popleft()
+            lookup.last_scan = recent_scans[-1] if recent_scans else None
+            lookup.scan_count = len(recent_scans)
+
+            # Update cache
+            recent_scans.append((data.ts_epoch, data.zone_id))
+
+        if data.device_fingerprint:
+            device_users = self._device_user_cache.setdefault(data.device_fingerprint, set())
+            device_users.add(data.user_id)
+            lookup.device_user_count = len(device_users)
+
+        if data.ip_address:
+            ip_users = self._ip_user_cache.setdefault(data.ip_address, set())
+            ip_users.add(data.user_id)
+            lookup.ip_user_count = len(ip_users)
+
+        cache_key = f"user_tx:{data.user_id}"
+        user_transactions = self._user_transaction_cache.get(cache_key)
+        if user_transactions is None:
+            user_transactions = deque(maxlen=100)
+        # Re-inserting refreshes the TTL, so only idle users' histories expire
+        self._user_transaction_cache[cache_key] = user_transactions
+
+        # Drop everything older than an hour, then count the 5min burst by bisection
+        now = time.time()
+        hour_ago = now - self.VELOCITY_WINDOW_S
+        while user_transactions and user_transactions[0] <= hour_ago:
+            user_transactions.popleft()
+        times = np.fromiter(user_transactions, dtype=np.float64, count=len(user_transactions))
+        lookup.tx_count_1h = times.size
+        lookup.tx_count_5min = times.size - int(
+            np.searchsorted(times, now - self.BURST_WINDOW_S, side='right')
+        )
+
+        # Update cache
+        user_transactions.append(data.ts_epoch)
+
+        return lookup
+
+    async def _redis_pipeline(self, data: TransactionData) -> _CacheLookup:
+        """
+        Cache lookup against Redis in a single pipelined round trip.
+
+        - ticket scans: last "zone|time" swapped in with SET ... GET, plus an INCR
+          counter, both expiring after the 4h window (Redis >= 7)
+        - device/IP links: sets of user IDs with a 24h TTL
+        - velocity: sorted set of the user's transactions over the last hour
+        """
+        prefix = self.REDIS_KEY_PREFIX
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+
+        is_scan = data.transaction_type == 'ticket_scan' and bool(data.ticket_id)
+        if is_scan:
+            zone_key = f"{prefix}ticket_zone:{data.ticket_id}"
+            count_key = f"{prefix}ticket_scans:{data.ticket_id}"
+            pipe.set(
+                zone_key,
+                f"{data.zone_id or ''}|{data.ts_epoch}",
+                ex=self.TICKET_SCAN_WINDOW_S,
+                get=True,
+            )
+            pipe.incr(count_key)
+            pipe.expire(count_key, self.TICKET_SCAN_WINDOW_S, nx=True)
+
+        links = []
+        for kind, value in (('device', data.device_fingerprint), ('ip', data.ip_address)):
+            if value:
+                link_key = f"{prefix}{kind}_users:{value}"
+                pipe.sadd(link_key, data.user_id)
+                pipe.scard(link_key)
+                pipe.expire(link_key, self.ACCOUNT_LINK_TTL_S)
+                links.append(kind)
+
+        tx_key = f"{prefix}user_tx:{data.user_id}"
+        pipe.zremrangebyscore(tx_key, 0, now - self.VELOCITY_WINDOW_S)
+        pipe.zcount(tx_key, now - self.BURST_WINDOW_S, '+inf')
+        pipe.zcard(tx_key)
+        pipe.zadd(tx_key, {data.transaction_id: data.ts_epoch})
+        pipe.expire(tx_key, self.VELOCITY_WINDOW_S)
+
+        replies = await pipe.execute()
+        lookup = _CacheLookup()
+        pos = 0
+
+        if is_scan:
+            last, lookup.scan_count = replies[pos], replies[pos + 1] - 1
+            pos += 3
+            if last:
+                if isinstance(last, bytes):
+                    last = last.decode()
+                zone, last_ts = last.rsplit('|', 1)
+                lookup.last_scan = (float(last_ts), zone or None)
+
+        for kind in links:
+            if kind == 'device':
+                lookup.device_user_count = replies[pos + 1]
+            else:
+                lookup.ip_user_count = replies[pos + 1]
+            pos += 3
+
+        lookup.tx_count_5min, lookup.tx_count_1h = replies[pos + 1], replies[pos + 2]
+        return lookup
+
+    def _sync_checks(
         self,
         data: TransactionData,
+        lookup: _CacheLookup,
+    ) -> Tuple[List[FraudType], Dict[str, Any]]:
+        """Run the cache-based checks inline, without a task per check."""
+        fraud_types: List[FraudType] = []
+        details: Dict[str, Any] = {}
+
+        for check in self._sync_check_fns:
+            try:
+                check_fraud_types, check_details = check(data, lookup)
+            except Exception as e:
+                logger.error("Check %s failed: %s", check.__name__, e)
+                continue
+            fraud_types.extend(check_fraud_types)
+            details.update(check_details)
+
+        return fraud_types, details
+
+    def _check_ticket_fraud(
+        self,
+        data: TransactionData,
+        lookup: _CacheLookup,
     ) -> Tuple[List[FraudType], Dict[str, Any]]:
         """Check for ticket-related fraud."""
         fraud_types = []
@@ -353,39 +671,28 @@ class FraudDetector:
             return fraud_types, details
 
         # Check for duplicate scans (same ticket, different locations)
-        cache_key = f"ticket:{data.ticket_id}"
-        recent_scans = self._ticket_scan_cache.get(cache_key, [])
-
-        # Filter to recent scans (last 4 hours)
-        cutoff = datetime.utcnow() - timedelta(hours=4)
-        recent_scans = [(ts, zone) for ts, zone in recent_scans if ts > cutoff]
-
-        if recent_scans:
-            last_scan_time, last_zone = recent_scans[-1]
-            time_since_last = (data.timestamp - last_scan_time).total_seconds()
+        if lookup.last_scan is not None:
+            last_scan_time, last_zone = lookup.last_scan
+            time_since_last = data.ts_epoch - last_scan_time
 
             # Same ticket scanned at different location within short time
             if data.zone_id and data.zone_id != last_zone and time_since_last < 300:
                 fraud_types.append(FraudType.DUPLICATE_TICKET)
                 details['duplicate_ticket'] = {
-                    'last_scan_time': last_scan_time.isoformat(),
+                    'last_scan_time': _from_epoch(last_scan_time).isoformat(),
                     'last_zone': last_zone,
                     'current_zone': data.zone_id,
                     'time_difference_seconds': time_since_last,
                 }
 
             # Too many scans in short period
-            if len(recent_scans) > 5:
+            if lookup.scan_count > 5:
                 fraud_types.append(FraudType.SUSPICIOUS_BEHAVIOR)
                 details['excessive_scans'] = {
-                    'scan_count': len(recent_scans),
+                    'scan_count': lookup.scan_count,
                     'period_hours': 4,
                 }
 
-        # Update cache
-        recent_scans.append((data.timestamp, data.zone_id))
-        self._ticket_scan_cache[cache_key] = recent_scans[-10:]  # Keep last 10
-
         return fraud_types, details
 
     async def _check_transaction_anomalies(
@@ -399,9 +706,15 @@ class FraudDetector:
         if data.transaction_type not in ['cashless_topup', 'cashless_payment', 'ticket_purchase']:
             return fraud_types, details
 
-        # Run anomaly detection
-        anomaly_result = await self.anomaly_detector.detect(data)
+        # Run anomaly detection, batched with any concurrent checks
+        if self._batch_task is not None:
+            future = asyncio.get_running_loop().create_future()
+            self._batch_q.put_nowait((data, future))
+            anomaly_result = await future
+        else:
+            anomaly_result = await self.anomaly_detector.detect(data)
         details['anomaly_scores'] = anomaly_result.scores
+        details['anomaly_confidence'] = anomaly_result.confidence
 
         if anomaly_result.is_anomaly:
             for anomaly_type in anomaly_result.anomaly_types:
@@ -413,15 +726,50 @@ class FraudDetector:
                     fraud_types.append(FraudType.SUSPICIOUS_BEHAVIOR)
 
             details['anomalies'] = {
-                'types': [t.value for t in anomaly_result.anomaly_types],
+                'types': [_AT_VALUES[t] for t in anomaly_result.anomaly_types],
                 'confidence': anomaly_result.confidence,
             }
 
         return fraud_types, details
 
-    async def _check_multiple_accounts(
+    async def _anomaly_batcher(self) -> None:
+        """Collect anomaly checks for up to BATCH_WINDOW_MS and score them together."""
+        loop = asyncio.get_running_loop()
+        window_s = self.BATCH_WINDOW_MS / 1000
+
+        while True:
+            batch = [await self._batch_q.get()]
+            # Any failure resolves the whole batch with the error: an unresolved
+            # future would hang its check, and the batcher itself must keep running
+            try:
+                deadline = loop.time() + window_s
+                while len(batch) < self.BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._batch_q.get(), timeout))
+                    except TimeoutError:
+                        break
+
+                results = await self.anomaly_detector.detect_batch([data for data, _ in batch])
+                for (_, future), result in zip(batch, results, strict=True):
+                    if not future.done():
+                        future.set_result(result)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                logger.error("Anomaly batch of %d failed: %s", len(batch), e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _check_multiple_accounts(
         self,
         data: TransactionData,
+        lookup: _CacheLookup,
     ) -> Tuple[List[FraudType], Dict[str, Any]]:
         """Check for multiple accounts from same device/IP."""
         fraud_types = []
@@ -429,53 +777,38 @@ class FraudDetector:
 
         # Check device fingerprint
         if data.device_fingerprint:
-            device_users = self._device_user_cache.get(data.device_fingerprint, set())
-            device_users.add(data.user_id)
-            self._device_user_cache[data.device_fingerprint] = device_users
-
-            if len(device_users) > 3:  # More than 3 users from same device
+            if lookup.device_user_count > 3:  # More than 3 users from same device
                 fraud_types.append(FraudType.MULTIPLE_ACCOUNTS)
                 details['multiple_accounts_device'] = {
-                    'user_count': len(device_users),
+                    'user_count': lookup.device_user_count,
                     'device_hash': self._hash_for_gdpr(data.device_fingerprint),
                 }
 
         # Check IP address
         if data.ip_address:
-            ip_users = self._ip_user_cache.get(data.ip_address, set())
-            ip_users.add(data.user_id)
-            self._ip_user_cache[data.ip_address] = ip_users
-
             # Higher threshold for IP (NAT, shared networks)
-            if len(ip_users) > 10:
+            if lookup.ip_user_count > 10:
                 if FraudType.MULTIPLE_ACCOUNTS not in fraud_types:
                     fraud_types.append(FraudType.MULTIPLE_ACCOUNTS)
                 details['multiple_accounts_ip'] = {
-                    'user_count': len(ip_users),
+                    'user_count': lookup.ip_user_count,
                     'ip_hash': self._hash_for_gdpr(data.ip_address),
                 }
 
         return fraud_types, details
 
-    async def _check_velocity(
+    def _check_velocity(
         self,
         data: TransactionData,
+        lookup: _CacheLookup,
     ) -> Tuple[List[FraudType], Dict[str, Any]]:
         """Check for velocity abuse (too many transactions too fast)."""
         fraud_types = []
         details = {}
 
-        cache_key = f"user_tx:{data.user_id}"
-        user_transactions = self._user_transaction_cache.get(cache_key, [])
-
-        # Filter to last hour
-        cutoff = datetime.utcnow() - timedelta(hours=1)
-        user_transactions = [ts for ts in user_transactions if ts > cutoff]
-
         # Velocity checks
-        tx_count_1h = len(user_transactions)
-        tx_count_5min = len([ts for ts in user_transactions
-                           if ts > datetime.utcnow() - timedelta(minutes=5)])
+        tx_count_1h = lookup.tx_count_1h
+        tx_count_5min = lookup.tx_count_5min
 
         velocity_flags = []
 
@@ -489,7 +822,7 @@ class FraudDetector:
 
         # Check for repeated top-ups
         if data.transaction_type == 'cashless_topup':
-            topup_count = sum(1 for _ in user_transactions[-20:])  # Simplified
+            topup_count = min(tx_count_1h, 20)  # Simplified
             if topup_count > 5:
                 velocity_flags.append('repeated_topups')
 
@@ -501,15 +834,12 @@ class FraudDetector:
                 'tx_count_5min': tx_count_5min,
             }
 
-        # Update cache
-        user_transactions.append(data.timestamp)
-        self._user_transaction_cache[cache_key] = user_transactions[-100:]
-
         return fraud_types, details
 
-    async def _check_geolocation(
+    def _check_geolocation(
         self,
         data: TransactionData,
+        lookup: _CacheLookup,
     ) -> Tuple[List[FraudType], Dict[str, Any]]:
         """Check for impossible geolocation (same ticket at two distant places)."""
         fraud_types = []
@@ -522,10 +852,30 @@ class FraudDetector:
         # For now, return empty results
         return fraud_types, details
 
+    def _fast_path_score(self, anomaly_scores: Dict[str, float]) -> Optional[float]:
+        """
+        Preliminary risk score if every anomaly score is below its fast-path cutoff.
+
+        Returns None (full scoring required) when no ML model scored the
+        transaction or any score, including an unknown one, reaches its cutoff.
+        The result is the worst score's fraction of its cutoff scaled onto
+        [0, THRESHOLD_FLAG / 2), so fast-path transactions stay LOW.
+        """
+        if self._MODEL_SCORES.isdisjoint(anomaly_scores):
+            return None
+
+        worst = 0.0
+        for name, score in anomaly_scores.items():
+            cutoff = self.FAST_PATH_SCORE_CUTOFFS.get(name)
+            if cutoff is None or score >= cutoff:
+                return None
+            worst = max(worst, score / cutoff)
+        return worst * self.THRESHOLD_FLAG / 2
+
     def _determine_action(
         self,
         risk_score: float,
-        fraud_types: List[FraudType],
+        fraud_mask: int,
     ) -> Tuple[FraudAction, bool, bool]:
         """
         Determine what action to take based on risk score.
@@ -537,13 +887,7 @@ class FraudDetector:
         alert_required = False
 
         # Critical fraud types always trigger block
-        critical_types = {
-            FraudType.DUPLICATE_TICKET,
-            FraudType.FALSIFIED_TICKET,
-            FraudType.PAYMENT_FRAUD,
-        }
-
-        if any(ft in critical_types for ft in fraud_types):
+        if fraud_mask & self._CRITICAL_MASK:
             return FraudAction.BLOCK, True, True
 
         # Score-based actions
@@ -614,6 +958,21 @@ class FraudDetector:
 
         return recommendations
 
+    async def _alert_worker(self) -> None:
+        """Drain the alert queue until cancelled."""
+        while True:
+            data, result = await self._alert_queue.get()
+            try:
+                await self._generate_alert(data, result)
+            except Exception as e:
+                logger.error("Alert generation failed for %s: %s", data.transaction_id, e)
+            finally:
+                self._alert_queue.task_done()
+
+    async def flush_alerts(self) -> None:
+        """Wait until every queued alert has been generated."""
+        await self._alert_queue.join()
+
     async def _generate_alert(
         self,
         data: TransactionData,
@@ -644,23 +1003,25 @@ class FraudDetector:
             festival_id=data.festival_id,
             description=self._generate_alert_description(result),
             evidence=self._anonymize_evidence(result.details),
-            recommended_action=result.action.value,
+            recommended_action=_FA_VALUES[result.action],
             auto_blocked=result.should_block,
         )
 
-        self._alerts.append(alert)
+        self._store_alert(alert)
         self._stats['alerts_generated'] += 1
 
         logger.warning(
-            f"Fraud alert generated: {alert.alert_id} "
-            f"(severity={severity}, score={result.risk_score:.1f})"
+            "Fraud alert generated: %s (severity=%s, score=%.1f)",
+            alert.alert_id,
+            severity,
+            result.risk_score,
         )
 
         return alert
 
     def _generate_alert_description(self, result: FraudCheckResult) -> str:
         """Generate human-readable alert description."""
-        fraud_type_names = [ft.value.replace('_', ' ').title() for ft in result.fraud_types]
+        fraud_type_names = [self._PRETTY[ft] for ft in result.fraud_types]
 
         if len(fraud_type_names) == 0:
             return f"Suspicious activity detected (risk score: {result.risk_score:.0f})"
@@ -671,22 +1032,26 @@ class FraudDetector:
 
     def _anonymize_evidence(self, details: Dict[str, Any]) -> Dict[str, Any]:
         """Anonymize evidence for GDPR compliance."""
-        # Deep copy and anonymize sensitive fields
-        anonymized = {}
-
-        for key, value in details.items():
-            if isinstance(value, dict):
-                anonymized[key] = self._anonymize_evidence(value)
-            elif key in ('ip_address', 'device_fingerprint', 'user_id', 'device_id'):
-                anonymized[key] = self._hash_for_gdpr(str(value))
-            else:
-                anonymized[key] = value
+        # Copy nested dicts and hash sensitive fields, walking with a stack
+        anonymized: Dict[str, Any] = {}
+        stack = [(details, anonymized)]
+
+        while stack:
+            source, target = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict):
+                    target[key] = child = {}
+                    stack.append((value, child))
+                elif key in self._SENSITIVE:
+                    target[key] = self._hash_for_gdpr(str(value))
+                else:
+                    target[key] = value
 
         return anonymized
 
     def _hash_for_gdpr(self, value: str) -> str:
         """Hash a value for GDPR compliance (anonymization)."""
-        return hashlib.sha256(value.encode()).hexdigest()[:16]
+        return _gdpr_hash(value)
 
     def _update_stats(self, result: FraudCheckResult) -> None:
         """Update internal statistics."""
@@ -697,17 +1062,18 @@ class FraudDetector:
         elif result.action in (FraudAction.FLAG, FraudAction.REVIEW):
             self._stats['flagged'] += 1
 
-        # Update moving average of processing time
-        n = self._stats['total_checks']
-        old_avg = self._stats['avg_processing_time_ms']
-        self._stats['avg_processing_time_ms'] = (
-            old_avg * (n - 1) + result.processing_time_ms
-        ) / n
+        # Running total; the average is derived in get_statistics()
+        self._stats['total_processing_time_ms'] += result.processing_time_ms
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get fraud detection statistics."""
+        total_checks = self._stats['total_checks']
         return {
             **self._stats,
+            'avg_processing_time_ms': (
+                self._stats['total_processing_time_ms'] / total_checks if total_checks else 0.0
+            ),
+            'fast_path_ratio': self._stats['fast_path'] / max(total_checks, 1),
             'pending_alerts': len(self._alerts),
             'cache_sizes': {
                 'ticket_scans': len(self._ticket_scan_cache),
@@ -717,22 +1083,24 @@ class FraudDetector:
             },
         }
 
+    def _store_alert(self, alert: FraudAlert) -> None:
+        """Insert an alert keeping both alert lists ordered by timestamp."""
+        bisect.insort(self._alerts, alert, key=_alert_time)
+        bisect.insort(self._alerts_by_severity[alert.severity], alert, key=_alert_time)
+
     def get_alerts(
         self,
         limit: int = 100,
         severity: Optional[str] = None,
         since: Optional[datetime] = None,
     ) -> List[FraudAlert]:
-        """Get fraud alerts."""
-        alerts = self._alerts
+        """Get fraud alerts, newest first."""
+        alerts = self._alerts_by_severity.get(severity, []) if severity else self._alerts
 
-        if severity:
-            alerts = [a for a in alerts if a.severity == severity]
-
-        if since:
-            alerts = [a for a in alerts if a.timestamp >= since]
-
-        return sorted(alerts, key=lambda a: a.timestamp, reverse=True)[:limit]
+        # Both lists are kept sorted: bisect to 'since', then take the newest 'limit'
+        start = bisect.bisect_left(alerts, since, key=_alert_time) if since else 0
+        stop = max(start, len(alerts) - limit)
+        return alerts[stop:][::-1]
 
     async def report_fraud(
         self,
@@ -778,10 +1146,10 @@ class FraudDetector:
             auto_blocked=False,
         )
 
-        self._alerts.append(alert)
+        self._store_alert(alert)
         self._stats['alerts_generated'] += 1
 
-        logger.info(f"Manual fraud report created: {alert.alert_id}")
+        logger.info("Manual fraud report created: %s", alert.alert_id)
 
         # Trigger pattern learning for manual reports
         await self.pattern_recognizer.learn_from_report(
@@ -807,17 +1175,19 @@ class FraudDetector:
         Returns:
             Training metrics
         """
-        logger.info(f"Starting model training with {len(training_data)} samples...")
+        logger.info("Starting model training with %d samples...", len(training_data))
 
         # Anonymize training data for GDPR
         anonymized_data = [
             self._anonymize_for_training(d) for d in training_data
         ]
 
-        # Train components
-        anomaly_metrics = await self.anomaly_detector.train(anonymized_data)
-        pattern_metrics = await self.pattern_recognizer.train(anonymized_data, labels)
-        scorer_metrics = await self.risk_scorer.calibrate(anonymized_data, labels)
+        # Train components concurrently; each runs its model fits in worker threads
+        anomaly_metrics, pattern_metrics, scorer_metrics = await asyncio.gather(
+            self.anomaly_detector.train(anonymized_data),
+            self.pattern_recognizer.train(anonymized_data, labels),
+            self.risk_scorer.calibrate(anonymized_data, labels),
+        )
 
         metrics = {
             'samples': len(training_data),
@@ -827,7 +1197,7 @@ class FraudDetector:
             'timestamp': datetime.utcnow().isoformat(),
         }
 
-        logger.info(f"Model training completed: {metrics}")
+        logger.info("Model training completed: %s", metrics)
 
         return metrics
 
@@ -851,6 +1221,22 @@ class FraudDetector:
 
     async def cleanup(self) -> None:
         """Cleanup resources."""
+        # Checks after cleanup go through initialize() again and restart the workers
+        self._initialized = False
+
+        # Let queued alerts finish, then stop the workers
+        if self._alert_workers:
+            await self.flush_alerts()
+            for worker in self._alert_workers:
+                worker.cancel()
+            await asyncio.gather(*self._alert_workers, return_exceptions=True)
+            self._alert_workers = []
+
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            await asyncio.gather(self._batch_task, return_exceptions=True)
+            self._batch_task = None
+
         # Clear caches
         self._ticket_scan_cache.clear()
         self._user_transaction_cache.clear()
@@ -15,6 +15,7 @@ Performance: <50ms for pattern matching
 GDPR: All patterns are learned from anonymized data
 """
 
+import asyncio
 import logging
 import pickle
 from dataclasses import dataclass, field
@@ -390,12 +391,13 @@ class MLPatternRecognizer:
         X = np.array([self._extract_features(d) for d in training_data])
         y = np.array(labels)
 
-        # Scale features
-        self.scaler = StandardScaler()
-        X_scaled = self.scaler.fit_transform(X)
+        # Scale features (scaler and model are swapped in together once fitted,
+        # since training runs in a worker thread alongside predict())
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
 
         # Train Random Forest
-        self.model = RandomForestClassifier(
+        model = RandomForestClassifier(
             n_estimators=self.n_estimators,
             max_depth=self.max_depth,
             min_samples_leaf=self.min_samples_leaf,
@@ -403,8 +405,9 @@ class MLPatternRecognizer:
             n_jobs=-1,
             class_weight='balanced',
         )
-        self.model.fit(X_scaled, y)
+        model.fit(X_scaled, y)
 
+        self.scaler, self.model = scaler, model
         self._is_trained = True
 
         # Calculate metrics
@@ -715,7 +718,8 @@ class PatternRecognizer:
             # Unsupervised - just store patterns
             return {'status': 'skipped', 'reason': 'no labels provided'}
 
-        metrics = self.ml_recognizer.train(training_data, labels)
+        # CPU-bound fit; run it off the event loop
+        metrics = await asyncio.to_thread(self.ml_recognizer.train, training_data, labels)
 
         return metrics
 
@@ -18,11 +18,13 @@ from sentence_transformers import SentenceTransformer
 from sklearn.preprocessing import MinMaxScaler, StandardScaler
 
 from .types import (
+    AUDIO_FEATURE_KEYS,
     ArtistFeatures,
     InteractionType,
     SpotifyAudioFeatures,
     UserInteraction,
     UserPreferences,
+    quantize_int8,
 )
 
 
@@ -46,6 +48,11 @@ class FeatureExtractor:
         InteractionType.SKIP: -1.5,
     }
 
+    # Positions of the 0-1 scaled audio features inside the packed vector
+    _AUDIO_UNIT_INDEX = np.array(
+        [i for i, key in enumerate(AUDIO_FEATURE_KEYS) if key not in ("tempo", "loudness")]
+    )
+
     # Time decay half-life in days
     TIME_DECAY_HALFLIFE = 30
 
@@ -166,20 +173,13 @@ class FeatureExtractor:
             lastfm_listeners=lastfm_listeners,
         )
 
-        # Extract audio features as dict if provided
-        audio_features_dict = None
+        # Pack audio features into a float32 vector (AUDIO_FEATURE_KEYS order) if provided
+        audio_vector = None
         if audio_features:
-            audio_features_dict = {
-                "danceability": audio_features.danceability,
-                "energy": audio_features.energy,
-                "loudness": audio_features.loudness,
-                "speechiness": audio_features.speechiness,
-                "acousticness": audio_features.acousticness,
-                "instrumentalness": audio_features.instrumentalness,
-                "liveness": audio_features.liveness,
-                "valence": audio_features.valence,
-                "tempo": audio_features.tempo,
-            }
+            audio_vector = np.array(
+                [getattr(audio_features, key) for key in AUDIO_FEATURE_KEYS],
+                dtype=np.float32,
+            )
 
         # Generate embedding for artist
         embedding = self._generate_artist_embedding(
@@ -193,16 +193,16 @@ class FeatureExtractor:
             artist_id=artist_id,
             name=name,
             genres=genres,
-            sub_genres=sub_genres or [],
+            sub_genres=sub_genres or (),
             popularity_score=popularity_score,
             spotify_followers=spotify_followers,
             spotify_monthly_listeners=spotify_monthly_listeners,
             spotify_popularity=spotify_popularity,
             lastfm_playcount=lastfm_playcount,
             lastfm_listeners=lastfm_listeners,
-            audio_features=audio_features_dict,
-            similar_artists=similar_artists or [],
-            tags=tags or [],
+            audio_features=audio_vector,
+            similar_artists=similar_artists or (),
+            tags=tags or (),
             embedding=embedding,
         )
 
@@ -263,9 +263,9 @@ class FeatureExtractor:
         genres: list[str],
         sub_genres: list[str],
         tags: list[str],
-    ) -> list[float]:
+    ) -> np.ndarray:
         """
-        Generate an embedding vector for an artist.
+        Generate a float32 embedding vector for an artist.
 
         Combines name, genres, and tags into a text representation
         and encodes it using a sentence transformer.
@@ -287,11 +287,10 @@ class FeatureExtractor:
         text = " | ".join(text_parts)
 
         # Generate embedding
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        embedding_list = embedding.tolist()
+        embedding = self.model.encode(text, convert_to_numpy=True).astype(np.float32, copy=False)
 
-        self._embedding_cache[cache_key] = embedding_list
-        return embedding_list
+        self._embedding_cache[cache_key] = embedding
+        return embedding
 
     def get_genre_vector(self, genres: list[str]) -> np.ndarray:
         """
@@ -339,7 +338,7 @@ class FeatureExtractor:
         Returns:
             UserPreferences object
         """
-        return UserPreferences(
+        return UserPreferences.from_trusted(
             user_id=user_id,
             favorite_genres=favorite_genres,
             favorite_artists=favorite_artist_ids,
@@ -427,24 +426,27 @@ class FeatureExtractor:
         for artist_id in preferences.favorite_artists:
             if artist_id in artist_features:
                 feat = artist_features[artist_id]
-                if feat.embedding:
-                    weighted_embeddings.append(np.array(feat.embedding))
+                embedding = feat.embedding_vector()
+                if embedding is not None:
+                    weighted_embeddings.append(embedding)
                     weights.append(3.0)
 
         # Attended artists
         for artist_id in preferences.attended_artists:
             if artist_id in artist_features:
                 feat = artist_features[artist_id]
-                if feat.embedding:
-                    weighted_embeddings.append(np.array(feat.embedding))
+                embedding = feat.embedding_vector()
+                if embedding is not None:
+                    weighted_embeddings.append(embedding)
                     weights.append(2.5)
 
         # Listened artists
         for artist_id in preferences.listened_artists:
             if artist_id in artist_features:
                 feat = artist_features[artist_id]
-                if feat.embedding:
-                    weighted_embeddings.append(np.array(feat.embedding))
+                embedding = feat.embedding_vector()
+                if embedding is not None:
+                    weighted_embeddings.append(embedding)
                     weights.append(1.5)
 
         if not weighted_embeddings:
@@ -453,7 +455,7 @@ class FeatureExtractor:
 
         # Weighted average
         weights_array = np.array(weights).reshape(-1, 1)
-        embeddings_array = np.array(weighted_embeddings)
+        embeddings_array = np.stack(weighted_embeddings)
         user_embedding = np.average(embeddings_array, axis=0, weights=weights.copy())
 
         # Normalize
@@ -495,8 +497,8 @@ class FeatureExtractor:
 
     def compute_embedding_similarity(
         self,
-        embedding_a: list[float],
-        embedding_b: list[float],
+        embedding_a: np.ndarray,
+        embedding_b: np.ndarray,
     ) -> float:
         """
         Compute cosine similarity between two embeddings.
@@ -508,8 +510,8 @@ class FeatureExtractor:
         Returns:
             Cosine similarity between -1 and 1
         """
-        vec_a = np.array(embedding_a)
-        vec_b = np.array(embedding_b)
+        vec_a = np.asarray(embedding_a, dtype=np.float32)
+        vec_b = np.asarray(embedding_b, dtype=np.float32)
 
         norm_a = np.linalg.norm(vec_a)
         norm_b = np.linalg.norm(vec_b)
@@ -519,10 +521,69 @@ class FeatureExtractor:
 
         return float(np.dot(vec_a, vec_b) / (norm_a * norm_b))
 
+    @staticmethod
+    def build_int8_index(
+        artist_features: list[ArtistFeatures],
+    ) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """
+        Stack quantized artist embeddings into an int8 matrix for batch scoring.
+
+        Args:
+            artist_features: Artists with an embedding (float32 or int8)
+
+        Returns:
+            (artist_ids, int8 matrix of shape (n, dim), float32 per-row scales)
+        """
+        artist_ids = []
+        rows = []
+        scales = []
+
+        for feat in artist_features:
+            if feat.embedding_int8 is not None:
+                data, scale = feat.embedding_int8, feat.embedding_scale
+            elif feat.embedding is not None:
+                data, scale = quantize_int8(feat.embedding)
+            else:
+                continue
+            artist_ids.append(feat.artist_id)
+            rows.append(np.frombuffer(data, dtype=np.int8))
+            scales.append(scale)
+
+        if not rows:
+            return [], np.zeros((0, 0), dtype=np.int8), np.zeros(0, dtype=np.float32)
+
+        return artist_ids, np.stack(rows), np.asarray(scales, dtype=np.float32)
+
+    @staticmethod
+    def int8_dot_scores(
+        query: np.ndarray,
+        matrix: np.ndarray,
+        scales: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Approximate dot products of a query against an int8 embedding matrix.
+
+        The query is quantized too and the products accumulate in int32, so the
+        catalog is read as int8. Normalize embeddings before quantizing to get
+        cosine similarities.
+
+        Args:
+            query: float32 query embedding
+            matrix: int8 matrix from build_int8_index()
+            scales: per-row scales from build_int8_index()
+
+        Returns:
+            float32 scores, one per row
+        """
+        data, query_scale = quantize_int8(query)
+        q = np.frombuffer(data, dtype=np.int8)
+        dots = np.einsum("ij,j->i", matrix, q, dtype=np.int32)
+        return dots.astype(np.float32) * scales * np.float32(query_scale)
+
     def compute_audio_similarity(
         self,
-        features_a: dict[str, float],
-        features_b: dict[str, float],
+        features_a: np.ndarray,
+        features_b: np.ndarray,
     ) -> float:
         """
         Compute similarity between audio feature vectors.
@@ -530,34 +591,27 @@ class FeatureExtractor:
         Uses Euclidean distance normalized to 0-1 similarity.
 
         Args:
-            features_a: First audio features dict
-            features_b: Second audio features dict
+            features_a: First packed audio feature vector (AUDIO_FEATURE_KEYS order)
+            features_b: Second packed audio feature vector
 
         Returns:
             Similarity score between 0 and 1
         """
-        # Features to compare (excluding tempo and loudness which have different scales)
-        feature_keys = [
-            "danceability", "energy", "speechiness", "acousticness",
-            "instrumentalness", "liveness", "valence"
-        ]
-
-        vec_a = []
-        vec_b = []
-
-        for key in feature_keys:
-            if key in features_a and key in features_b:
-                vec_a.append(features_a[key])
-                vec_b.append(features_b[key])
-
-        if not vec_a:
+        # Compare only the 0-1 features (tempo and loudness have different scales);
+        # NaN marks a feature missing on either side
+        vec_a = features_a[self._AUDIO_UNIT_INDEX]
+        vec_b = features_b[self._AUDIO_UNIT_INDEX]
+        present = ~(np.isnan(vec_a) | np.isnan(vec_b))
+        n_present = int(present.sum())
+
+        if n_present == 0:
             return 0.0
 
         # Euclidean distance
-        distance = np.linalg.norm(np.array(vec_a) - np.array(vec_b))
+        distance = np.linalg.norm(vec_a[present] - vec_b[present])
 
         # Convert to similarity (max distance is sqrt(7) for 7 features in 0-1 range)
-        max_distance = np.sqrt(len(vec_a))
+        max_distance = np.sqrt(n_present)
         similarity = 1.0 - (distance / max_distance)
 
         return float(max(0.0, similarity))
@@ -569,7 +623,7 @@ class FeatureExtractor:
     def batch_extract_artist_embeddings(
         self,
         artists: list[dict],
-    ) -> dict[str, list[float]]:
+    ) -> dict[str, np.ndarray]:
         """
         Extract embeddings for multiple artists efficiently.
 
@@ -604,14 +658,16 @@ class FeatureExtractor:
 
         # Batch encode new texts
         if texts:
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
+            embeddings = self.model.encode(texts, convert_to_numpy=True).astype(
+                np.float32, copy=False
+            )
             for artist_id, embedding in zip(artist_ids, embeddings):
                 cache_key = self._cache_key(
                     "embedding",
                     next(a.get("name", "") for a in artists if a.get("id") == artist_id or a.get("artist_id") == artist_id),
                     tuple(next((a.get("genres", []) for a in artists if a.get("id") == artist_id or a.get("artist_id") == artist_id), []))
                 )
-                self._embedding_cache[cache_key] = embedding.tolist()
+                self._embedding_cache[cache_key] = embedding
 
         # Collect all results
         results = {}
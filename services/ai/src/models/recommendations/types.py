@@ -3,21 +3,136 @@ Type definitions for the Artist Recommendation System.
 
 This module defines all data models, enums, and type hints used
 throughout the recommendation system.
+
+Values built in bulk by the recommenders (ArtistFeatures, ArtistPerformance,
+SimilarArtist, UserInteraction, Recommendation, TrendingArtist) are frozen,
+slotted stdlib dataclasses: no per-instance __dict__, and constructing them
+runs no validation. Their Field constraints are kept as
+Annotated metadata and enforced only where Pydantic validates them, i.e. inside
+the request/response models or through ``validate()`` on untrusted input.
+
+Convention: validate at the API edge (``model_validate`` / ``validate()``), and
+use ``from_trusted()`` everywhere behind it, for data that came from our own
+database, cache or recommenders.
+
+Sequence fields on the frozen types are tuples defaulting to the shared empty
+tuple, so the common all-empty instance allocates no per-field containers.
 """
 
+import sys
+import time
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from enum import Enum
-from typing import Any, Optional
-
-from pydantic import BaseModel, Field
+from typing import (
+    Annotated,
+    Any,
+    ClassVar,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Union,
+    get_args,
+)
+
+import numpy as np
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    PlainSerializer,
+    TypeAdapter,
+    WithJsonSchema,
+    model_validator,
+)
+from pydantic_core import to_json
+
+__all__ = [
+    "RecommendationSourceValue",
+    "InteractionTypeValue",
+    "FeedbackTypeValue",
+    "ModelTypeValue",
+    "RecommendationSource",
+    "InteractionType",
+    "FeedbackType",
+    "ModelType",
+    "InternedId",
+    "AUDIO_FEATURE_KEYS",
+    "Float32Vector",
+    "AudioFeatureVector",
+    "quantize_int8",
+    "dequantize_int8",
+    "ArtistFeatures",
+    "ArtistPerformance",
+    "SimilarArtist",
+    "UserPreferences",
+    "ListenMetadata",
+    "SkipMetadata",
+    "ShareMetadata",
+    "ClickMetadata",
+    "ScheduleMetadata",
+    "LegacyMetadata",
+    "InteractionMetadata",
+    "UserInteraction",
+    "interaction_type_codes",
+    "UserFeedback",
+    "Recommendation",
+    "RecommendationBatch",
+    "RecommendationRequest",
+    "RecommendationResponse",
+    "stream_recommendation_response",
+    "TrendingRequest",
+    "TrendingArtist",
+    "TrendingResponse",
+    "ModelConfig",
+    "ABTestConfig",
+    "SpotifyArtistData",
+    "SpotifyAudioFeatures",
+    "LastFmArtistData",
+    "UserListeningHistory",
+    "RecommendationMetrics",
+    "ModelEvaluation",
+]
 
 
 # =============================================================================
-# ENUMS
+# ENUMERATED VALUES
 # =============================================================================
 
 
-class RecommendationSource(str, Enum):
+# Fields are typed with the Literal aliases, which pydantic-core checks as a set
+# lookup; the classes are plain string constants for use in code.
+
+RecommendationSourceValue = Literal[
+    "collaborative",
+    "content_based",
+    "hybrid",
+    "trending",
+    "cold_start",
+    "similar_artists",
+    "spotify",
+    "lastfm",
+]
+
+InteractionTypeValue = Literal[
+    "favorite",
+    "listen",
+    "attended",
+    "share",
+    "like",
+    "click",
+    "skip",
+    "add_to_schedule",
+]
+
+FeedbackTypeValue = Literal["like", "dislike", "not_interested", "already_seen"]
+
+ModelTypeValue = Literal["als", "bpr", "lightfm", "content", "graph"]
+
+
+class RecommendationSource:
     """Source of a recommendation."""
 
     COLLABORATIVE = "collaborative"
@@ -30,7 +145,7 @@ class RecommendationSource(str, Enum):
     LASTFM = "lastfm"
 
 
-class InteractionType(str, Enum):
+class InteractionType:
     """Types of user-artist interactions."""
 
     FAVORITE = "favorite"
@@ -43,7 +158,7 @@ class InteractionType(str, Enum):
     ADD_TO_SCHEDULE = "add_to_schedule"
 
 
-class FeedbackType(str, Enum):
+class FeedbackType:
     """Types of feedback a user can provide."""
 
     LIKE = "like"
@@ -52,7 +167,7 @@ class FeedbackType(str, Enum):
     ALREADY_SEEN = "already_seen"
 
 
-class ModelType(str, Enum):
+class ModelType:
     """Available recommendation model types."""
 
     ALS = "als"  # Alternating Least Squares
@@ -62,31 +177,220 @@ class ModelType(str, Enum):
     GRAPH = "graph"  # Graph neural network
 
 
+# Small-int codes for the enumerated values, used by columnar (numpy) batches
+_IDX_TO_SOURCE: tuple[str, ...] = get_args(RecommendationSourceValue)
+_SOURCE_TO_IDX: dict[str, int] = {s: i for i, s in enumerate(_IDX_TO_SOURCE)}
+
+_IDX_TO_INTERACTION: tuple[str, ...] = get_args(InteractionTypeValue)
+_INTERACTION_TO_IDX: dict[str, int] = {t: i for i, t in enumerate(_IDX_TO_INTERACTION)}
+
+
+# =============================================================================
+# TIMESTAMPS
+# =============================================================================
+
+_NOW_RESOLUTION_S = 0.01
+_now_cache: tuple[float, datetime] = (0.0, datetime.utcfromtimestamp(0))
+
+
+def _now() -> datetime:
+    """
+    Naive UTC now, reused for up to 10ms.
+
+    Default for bulk-built values so a burst of interactions shares one datetime
+    instead of allocating one per instance. Single-shot responses keep utcnow.
+    """
+    global _now_cache
+    t = time.time()
+    cached_t, cached = _now_cache
+    if t - cached_t > _NOW_RESOLUTION_S:
+        cached = datetime.utcfromtimestamp(t)
+        _now_cache = (t, cached)
+    return cached
+
+
+# =============================================================================
+# IDENTIFIERS
+# =============================================================================
+
+# The same few thousand artist/user ids recur across millions of values built
+# during batch scoring; interning makes them share one string object each.
+InternedId = Annotated[str, AfterValidator(sys.intern)]
+
+_ID_FIELDS = ("artist_id", "user_id")
+
+
+def _intern_ids(data: dict[str, Any]) -> dict[str, Any]:
+    """Intern the id fields of from_trusted() keyword data (validation does it otherwise)."""
+    for name in _ID_FIELDS:
+        value = data.get(name)
+        if type(value) is str:
+            data[name] = sys.intern(value)
+    return data
+
+
+# =============================================================================
+# VECTOR FIELDS
+# =============================================================================
+
+# Order of the values packed into ArtistFeatures.audio_features
+AUDIO_FEATURE_KEYS: tuple[str, ...] = (
+    "danceability",
+    "energy",
+    "loudness",
+    "speechiness",
+    "acousticness",
+    "instrumentalness",
+    "liveness",
+    "valence",
+    "tempo",
+)
+
+
+def _as_float32(value: Any) -> Any:
+    """Coerce a list, raw float32 bytes or array to a contiguous float32 vector."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return np.frombuffer(value, dtype=np.float32)
+    return np.ascontiguousarray(value, dtype=np.float32)
+
+
+def _as_audio_vector(value: Any) -> Any:
+    """Like _as_float32, also accepting a feature-name dict (missing values become NaN)."""
+    if isinstance(value, dict):
+        return np.array([value.get(k, np.nan) for k in AUDIO_FEATURE_KEYS], dtype=np.float32)
+    return _as_float32(value)
+
+
+_VECTOR_SERIALIZER = PlainSerializer(
+    lambda v: v.tolist(), return_type=list[float], when_used="json"
+)
+_VECTOR_SCHEMA = WithJsonSchema({"type": "array", "items": {"type": "number"}})
+
+Float32Vector = Annotated[
+    np.ndarray, BeforeValidator(_as_float32), _VECTOR_SERIALIZER, _VECTOR_SCHEMA
+]
+AudioFeatureVector = Annotated[
+    np.ndarray, BeforeValidator(_as_audio_vector), _VECTOR_SERIALIZER, _VECTOR_SCHEMA
+]
+
+
+def quantize_int8(vector: Any) -> tuple[bytes, float]:
+    """
+    Symmetric per-vector int8 quantization.
+
+    Returns ``(q.tobytes(), scale)`` with ``vector ~= q * scale``; a quarter of
+    the float32 size, for storing and caching embeddings.
+    """
+    v = np.asarray(vector, dtype=np.float32)
+    peak = float(np.abs(v).max()) if v.size else 0.0
+    scale = peak / 127.0 if peak > 0.0 else 1.0
+    q = np.clip(np.rint(v / scale), -127, 127).astype(np.int8)
+    return q.tobytes(), scale
+
+
+def dequantize_int8(data: bytes, scale: float) -> np.ndarray:
+    """Inverse of quantize_int8, as a float32 vector."""
+    return np.frombuffer(data, dtype=np.int8).astype(np.float32) * np.float32(scale)
+
+
+# =============================================================================
+# VALUE TYPES
+# =============================================================================
+
+_ADAPTERS: dict[type, TypeAdapter] = {}
+_LIST_ADAPTERS: dict[type, TypeAdapter] = {}
+
+
+class _ValueType:
+    """Validation and serialization helpers for the dataclass value types."""
+
+    __slots__ = ()
+
+    @classmethod
+    def _adapter(cls) -> TypeAdapter:
+        adapter = _ADAPTERS.get(cls)
+        if adapter is None:
+            adapter = _ADAPTERS[cls] = TypeAdapter(cls)
+        return adapter
+
+    @classmethod
+    def validate(cls, data: Any):
+        """Build an instance from untrusted input, enforcing the field constraints."""
+        return cls._adapter().validate_python(data)
+
+    @classmethod
+    def validate_batch(cls, rows: Any) -> list:
+        """Validate a whole list of untrusted rows in one pydantic-core call."""
+        adapter = _LIST_ADAPTERS.get(cls)
+        if adapter is None:
+            adapter = _LIST_ADAPTERS[cls] = TypeAdapter(list[cls])
+        return adapter.validate_python(rows)
+
+    @classmethod
+    def from_trusted(cls, **data: Any):
+        """Build an instance from already-valid data (plain construction)."""
+        return cls(**_intern_ids(data))
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-compatible dict, for API boundaries that need plain data."""
+        return self._adapter().dump_python(self, mode="json")
+
+
+class _TrustedModel(BaseModel):
+    """BaseModel that internal code can build without re-validating."""
+
+    @classmethod
+    def from_trusted(cls, **data: Any):
+        """Build from already-valid data via model_construct (defaults still applied)."""
+        return cls.model_construct(**_intern_ids(data))
+
+
+class _ResponseModel(_TrustedModel):
+    """API response that renders itself to JSON bytes in a single serializer pass."""
+
+    model_config = ConfigDict(defer_build=False)
+
+    def to_json(self) -> bytes:
+        """
+        Serialize the whole tree (nested dataclasses included) with pydantic-core.
+
+        Route handlers should return ``Response(response.to_json(),
+        media_type="application/json")`` so FastAPI skips ``jsonable_encoder``.
+        """
+        return self.model_dump_json(exclude_none=True).encode()
+
+
 # =============================================================================
 # ARTIST MODELS
 # =============================================================================
 
 
-class ArtistFeatures(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ArtistFeatures(_ValueType):
     """Features extracted from an artist for content-based recommendations."""
 
-    artist_id: str
+    artist_id: InternedId
     name: str
-    genres: list[str] = Field(default_factory=list)
-    sub_genres: list[str] = Field(default_factory=list)
-    popularity_score: float = Field(default=0.0, ge=0.0, le=1.0)
-    spotify_followers: int = Field(default=0, ge=0)
-    spotify_monthly_listeners: int = Field(default=0, ge=0)
-    spotify_popularity: int = Field(default=0, ge=0, le=100)
-    lastfm_playcount: int = Field(default=0, ge=0)
-    lastfm_listeners: int = Field(default=0, ge=0)
-    audio_features: Optional[dict[str, float]] = None  # tempo, energy, danceability, etc.
-    similar_artists: list[str] = Field(default_factory=list)
-    tags: list[str] = Field(default_factory=list)
-    embedding: Optional[list[float]] = None  # Pre-computed embedding vector
-
-    class Config:
-        json_schema_extra = {
+    genres: tuple[str, ...] = ()
+    sub_genres: tuple[str, ...] = ()
+    popularity_score: Annotated[float, Field(ge=0.0, le=1.0)] = 0.0
+    spotify_followers: Annotated[int, Field(ge=0)] = 0
+    spotify_monthly_listeners: Annotated[int, Field(ge=0)] = 0
+    spotify_popularity: Annotated[int, Field(ge=0, le=100)] = 0
+    lastfm_playcount: Annotated[int, Field(ge=0)] = 0
+    lastfm_listeners: Annotated[int, Field(ge=0)] = 0
+    audio_features: Optional[AudioFeatureVector] = None  # float32, AUDIO_FEATURE_KEYS order
+    similar_artists: tuple[str, ...] = ()
+    tags: tuple[str, ...] = ()
+    embedding: Optional[Float32Vector] = None  # Pre-computed embedding vector (float32)
+    embedding_int8: Optional[bytes] = None  # Quantized embedding, see quantize_int8()
+    embedding_scale: float = 0.0  # embedding ~= int8 values * embedding_scale
+
+    __pydantic_config__: ClassVar[ConfigDict] = ConfigDict(
+        arbitrary_types_allowed=True,
+        ser_json_bytes="base64",
+        val_json_bytes="base64",
+        json_schema_extra={
             "example": {
                 "artist_id": "artist-123",
                 "name": "The Midnight",
@@ -98,13 +402,30 @@ class ArtistFeatures(BaseModel):
                 "spotify_popularity": 72,
             }
         }
+    )
+
+    def embedding_vector(self) -> Optional[np.ndarray]:
+        """The float32 embedding, dequantized from the int8 form if that is all we hold."""
+        if self.embedding is not None:
+            return self.embedding
+        if self.embedding_int8 is not None:
+            return dequantize_int8(self.embedding_int8, self.embedding_scale)
+        return None
 
+    def quantized(self) -> "ArtistFeatures":
+        """Copy for storage/caching with the float32 embedding replaced by int8."""
+        if self.embedding is None:
+            return self
+        data, scale = quantize_int8(self.embedding)
+        return replace(self, embedding=None, embedding_int8=data, embedding_scale=scale)
 
-class ArtistPerformance(BaseModel):
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ArtistPerformance(_ValueType):
     """Artist performance at a festival."""
 
     performance_id: str
-    artist_id: str
+    artist_id: InternedId
     festival_id: str
     stage_id: str
     stage_name: str
@@ -114,13 +435,14 @@ class ArtistPerformance(BaseModel):
     is_headliner: bool = False
 
 
-class SimilarArtist(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class SimilarArtist(_ValueType):
     """An artist similar to another artist."""
 
-    artist_id: str
+    artist_id: InternedId
     name: str
-    similarity_score: float = Field(ge=0.0, le=1.0)
-    genres: list[str] = Field(default_factory=list)
+    similarity_score: Annotated[float, Field(ge=0.0, le=1.0)]
+    genres: tuple[str, ...] = ()
     image_url: Optional[str] = None
     reason: str = ""  # e.g., "Similar genre", "Fans also like"
 
@@ -130,50 +452,163 @@ class SimilarArtist(BaseModel):
 # =============================================================================
 
 
-class UserPreferences(BaseModel):
+class UserPreferences(_TrustedModel):
     """User preferences for recommendations."""
 
-    user_id: str
-    favorite_genres: list[str] = Field(default_factory=list)
-    favorite_artists: list[str] = Field(default_factory=list)
-    listened_artists: list[str] = Field(default_factory=list)  # From Spotify/Last.fm
-    attended_artists: list[str] = Field(default_factory=list)  # Past festival attendance
-    disliked_artists: list[str] = Field(default_factory=list)
-    preferred_performance_times: list[str] = Field(default_factory=list)  # e.g., ["evening", "night"]
+    user_id: InternedId
+    favorite_genres: tuple[str, ...] = ()
+    favorite_artists: tuple[str, ...] = ()
+    listened_artists: tuple[str, ...] = ()  # From Spotify/Last.fm
+    attended_artists: tuple[str, ...] = ()  # Past festival attendance
+    disliked_artists: tuple[str, ...] = ()
+    preferred_performance_times: tuple[str, ...] = ()  # e.g., ["evening", "night"]
     avoid_conflicts: bool = True  # Avoid recommending artists with overlapping times
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "user_id": "user-456",
                 "favorite_genres": ["electronic", "rock"],
                 "favorite_artists": ["artist-123", "artist-789"],
                 "listened_artists": ["artist-111", "artist-222"],
             }
-        }
+        },
+        frozen=True,
+        validate_assignment=False,
+        extra="ignore",
+        revalidate_instances="never",
+        defer_build=True,
+    )
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ListenMetadata(_ValueType):
+    """Details of a listen interaction."""
+
+    kind: Literal["listen"] = "listen"
+    track_id: Optional[str] = None
+    duration_ms: Annotated[int, Field(ge=0)] = 0
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class SkipMetadata(_ValueType):
+    """Details of a skip interaction."""
+
+    kind: Literal["skip"] = "skip"
+    track_id: Optional[str] = None
+    position_ms: Annotated[int, Field(ge=0)] = 0  # Playback position when skipped
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ShareMetadata(_ValueType):
+    """Details of a share interaction."""
+
+    kind: Literal["share"] = "share"
+    channel: str = ""  # e.g., "whatsapp", "instagram", "link"
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ClickMetadata(_ValueType):
+    """Details of a click interaction."""
+
+    kind: Literal["click"] = "click"
+    surface: str = ""  # e.g., "recommendations", "search", "lineup"
+    position: Optional[Annotated[int, Field(ge=0)]] = None  # Slot in the clicked list
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ScheduleMetadata(_ValueType):
+    """Details of an add-to-schedule interaction."""
+
+    kind: Literal["add_to_schedule"] = "add_to_schedule"
+    performance_id: Optional[str] = None
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class LegacyMetadata(_ValueType):
+    """Untagged metadata dict from older clients that fits no typed variant, kept as is."""
 
+    kind: Literal["legacy"] = "legacy"
+    data: dict[str, Any] = field(default_factory=dict)
 
-class UserInteraction(BaseModel):
+
+# Tagged by ``kind``, which pydantic-core resolves with one lookup
+InteractionMetadata = Annotated[
+    Union[
+        ListenMetadata, SkipMetadata, ShareMetadata, ClickMetadata, ScheduleMetadata,
+        LegacyMetadata,
+    ],
+    Field(discriminator="kind"),
+]
+
+# Interaction type -> field names of its typed metadata variant
+_METADATA_FIELDS = {
+    cls.__dataclass_fields__["kind"].default: frozenset(cls.__dataclass_fields__) - {"kind"}
+    for cls in (ListenMetadata, SkipMetadata, ShareMetadata, ClickMetadata, ScheduleMetadata)
+}
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class UserInteraction(_ValueType):
     """A single user-artist interaction."""
 
-    user_id: str
-    artist_id: str
-    interaction_type: InteractionType
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    user_id: InternedId
+    artist_id: InternedId
+    interaction_type: InteractionTypeValue
+    timestamp: datetime = field(default_factory=_now)
     festival_id: Optional[str] = None
-    weight: float = Field(default=1.0, ge=0.0)  # Interaction importance
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    weight: Annotated[float, Field(ge=0.0)] = 1.0  # Interaction importance
+    metadata: Optional[InteractionMetadata] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _tag_legacy_metadata(cls, data: Any) -> Any:
+        """
+        Accept the old untagged ``metadata`` dict.
+
+        It is tagged with the interaction type when its keys fit that type's
+        variant; anything else (including metadata on favorite, like and
+        attended interactions) is kept whole as LegacyMetadata.
+        """
+        if not isinstance(data, dict):
+            return data
+        metadata = data.get("metadata")
+        if not isinstance(metadata, dict) or "kind" in metadata:
+            return data
+        kind = data.get("interaction_type")
+        if kind in _METADATA_FIELDS and metadata.keys() <= _METADATA_FIELDS[kind]:
+            return {**data, "metadata": {"kind": kind, **metadata}}
+        return {**data, "metadata": {"kind": "legacy", "data": metadata}}
+
+
+def interaction_type_codes(interactions: list["UserInteraction"]) -> np.ndarray:
+    """int8 interaction-type codes (see _INTERACTION_TO_IDX) for a batch of interactions."""
+    return np.fromiter(
+        (_INTERACTION_TO_IDX[i.interaction_type] for i in interactions),
+        dtype=np.int8,
+        count=len(interactions),
+    )
 
 
 class UserFeedback(BaseModel):
     """User feedback on a recommendation."""
 
-    user_id: str
-    artist_id: str
+    user_id: InternedId
+    artist_id: InternedId
     recommendation_id: Optional[str] = None
-    feedback_type: FeedbackType
+    feedback_type: FeedbackTypeValue
     timestamp: datetime = Field(default_factory=datetime.utcnow)
-    source: RecommendationSource = RecommendationSource.HYBRID
+    source: RecommendationSourceValue = RecommendationSource.HYBRID
+
+    model_config = ConfigDict(defer_build=False)
+
+    @classmethod
+    def validate_batch(cls, rows: Any) -> list["UserFeedback"]:
+        """Validate a whole list of untrusted rows in one pydantic-core call."""
+        return _FEEDBACK_LIST.validate_python(rows)
+
+
+_FEEDBACK_LIST = TypeAdapter(list[UserFeedback])
 
 
 # =============================================================================
@@ -181,22 +616,23 @@ class UserFeedback(BaseModel):
 # =============================================================================
 
 
-class Recommendation(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class Recommendation(_ValueType):
     """A single artist recommendation."""
 
-    artist_id: str
+    artist_id: InternedId
     name: str
-    score: float = Field(ge=0.0, le=1.0)
-    source: RecommendationSource
-    genres: list[str] = Field(default_factory=list)
+    score: Annotated[float, Field(ge=0.0, le=1.0)]
+    source: RecommendationSourceValue
+    genres: tuple[str, ...] = ()
     image_url: Optional[str] = None
     reason: str = ""  # Human-readable explanation
     performance: Optional[ArtistPerformance] = None
-    confidence: float = Field(default=0.5, ge=0.0, le=1.0)
-    rank: int = Field(default=0, ge=0)
+    confidence: Annotated[float, Field(ge=0.0, le=1.0)] = 0.5
+    rank: Annotated[int, Field(ge=0)] = 0
 
-    class Config:
-        json_schema_extra = {
+    __pydantic_config__: ClassVar[ConfigDict] = ConfigDict(
+        json_schema_extra={
             "example": {
                 "artist_id": "artist-123",
                 "name": "The Midnight",
@@ -208,6 +644,155 @@ class Recommendation(BaseModel):
                 "rank": 1,
             }
         }
+    )
+
+
+@dataclass(slots=True)
+class RecommendationBatch:
+    """
+    Candidate recommendations stored column-wise for ranking.
+
+    Scoring, filtering and top-K selection work on the arrays; Recommendation
+    objects are only built for the final items by ``to_recommendations()``.
+    """
+
+    artist_ids: np.ndarray  # object
+    names: np.ndarray  # object
+    scores: np.ndarray  # float32
+    confidences: np.ndarray  # float32
+    sources: np.ndarray  # int8 code, see _SOURCE_TO_IDX
+    genres: np.ndarray  # object, one genre sequence per candidate
+    ranks: np.ndarray  # int32, 0 until ranked
+
+    @classmethod
+    def from_columns(
+        cls,
+        artist_ids: Iterable[str],
+        names: Iterable[str],
+        scores: Iterable[float],
+        source: RecommendationSourceValue,
+        confidences: Optional[Iterable[float]] = None,
+        genres: Optional[Iterable[tuple[str, ...]]] = None,
+    ) -> "RecommendationBatch":
+        """Build a batch from per-candidate columns produced by a single source."""
+        ids = np.asarray([sys.intern(a) for a in artist_ids], dtype=object)
+        n = len(ids)
+        genre_col = np.empty(n, dtype=object)
+        genre_col[:] = list(genres) if genres is not None else [()] * n
+        return cls(
+            artist_ids=ids,
+            names=np.asarray(list(names), dtype=object),
+            scores=np.asarray(list(scores), dtype=np.float32),
+            confidences=(
+                np.asarray(list(confidences), dtype=np.float32)
+                if confidences is not None
+                else np.full(n, 0.5, dtype=np.float32)
+            ),
+            sources=np.full(n, _SOURCE_TO_IDX[source], dtype=np.int8),
+            genres=genre_col,
+            ranks=np.zeros(n, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_recommendations(cls, recs: list[Recommendation]) -> "RecommendationBatch":
+        """Build a batch from already materialized recommendations (e.g. to re-rank a merge)."""
+        n = len(recs)
+        genre_col = np.empty(n, dtype=object)
+        genre_col[:] = [r.genres for r in recs]
+        return cls(
+            artist_ids=np.fromiter((r.artist_id for r in recs), dtype=object, count=n),
+            names=np.fromiter((r.name for r in recs), dtype=object, count=n),
+            scores=np.fromiter((r.score for r in recs), dtype=np.float32, count=n),
+            confidences=np.fromiter((r.confidence for r in recs), dtype=np.float32, count=n),
+            sources=np.fromiter((_SOURCE_TO_IDX[r.source] for r in recs), dtype=np.int8, count=n),
+            genres=genre_col,
+            ranks=np.fromiter((r.rank for r in recs), dtype=np.int32, count=n),
+        )
+
+    def __len__(self) -> int:
+        return len(self.artist_ids)
+
+    def take(self, index: np.ndarray) -> "RecommendationBatch":
+        """Subset by boolean mask or integer indices."""
+        return RecommendationBatch(
+            artist_ids=self.artist_ids[index],
+            names=self.names[index],
+            scores=self.scores[index],
+            confidences=self.confidences[index],
+            sources=self.sources[index],
+            genres=self.genres[index],
+            ranks=self.ranks[index],
+        )
+
+    def exclude_artists(self, artist_ids: Iterable[str]) -> "RecommendationBatch":
+        """Drop the given artists."""
+        excluded = set(artist_ids)
+        if not excluded:
+            return self
+        keep = np.fromiter(
+            (a not in excluded for a in self.artist_ids), dtype=bool, count=len(self)
+        )
+        return self.take(keep)
+
+    def filter_genres(
+        self,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> "RecommendationBatch":
+        """Keep candidates with any included genre and none of the excluded ones."""
+        if not include and not exclude:
+            return self
+        include_set = set(include or ())
+        exclude_set = set(exclude or ())
+        keep = np.fromiter(
+            (
+                (not include_set or not include_set.isdisjoint(g))
+                and exclude_set.isdisjoint(g)
+                for g in self.genres
+            ),
+            dtype=bool,
+            count=len(self),
+        )
+        return self.take(keep)
+
+    def top_k(self, k: int) -> "RecommendationBatch":
+        """The k highest-scoring candidates, best first, with ranks 1..k."""
+        n = len(self)
+        if k <= 0 or n == 0:
+            return self.take(np.zeros(0, dtype=np.intp))
+        if k < n:
+            index = np.argpartition(self.scores, n - k)[n - k:]
+        else:
+            index = np.arange(n)
+        index = index[np.argsort(-self.scores[index], kind="stable")]
+        top = self.take(index)
+        top.ranks = np.arange(1, len(index) + 1, dtype=np.int32)
+        return top
+
+    def to_recommendations(self) -> list[Recommendation]:
+        """Materialize Recommendation objects for the (already trimmed) batch."""
+        sources = _IDX_TO_SOURCE
+        return [
+            Recommendation.from_trusted(
+                artist_id=artist_id,
+                name=name,
+                score=float(score),
+                source=sources[source],
+                genres=genres,
+                confidence=float(confidence),
+                rank=int(rank),
+            )
+            for artist_id, name, score, source, genres, confidence, rank in zip(
+                self.artist_ids,
+                self.names,
+                self.scores,
+                self.sources,
+                self.genres,
+                self.confidences,
+                self.ranks,
+                strict=True,
+            )
+        ]
 
 
 class RecommendationRequest(BaseModel):
@@ -219,12 +804,14 @@ class RecommendationRequest(BaseModel):
     exclude_artists: list[str] = Field(default_factory=list)
     include_genres: Optional[list[str]] = None
     exclude_genres: Optional[list[str]] = None
-    model_type: Optional[ModelType] = None
+    model_type: Optional[ModelTypeValue] = None
     include_performance_info: bool = True
     diversity_factor: float = Field(default=0.3, ge=0.0, le=1.0)
 
+    model_config = ConfigDict(defer_build=False)
 
-class RecommendationResponse(BaseModel):
+
+class RecommendationResponse(_ResponseModel):
     """Response containing personalized recommendations."""
 
     user_id: str
@@ -238,6 +825,56 @@ class RecommendationResponse(BaseModel):
     processing_time_ms: float = 0.0
 
 
+_STREAM_CHUNK_ITEMS = 256
+_STREAMED_FIELDS = ("user_id", "festival_id", "recommendations", "total_count")
+
+
+def stream_recommendation_response(
+    user_id: str,
+    festival_id: str,
+    recommendations: Iterable[Recommendation],
+    **envelope: Any,
+) -> Iterator[bytes]:
+    """
+    Stream a RecommendationResponse JSON document without building the response.
+
+    Recommendations are serialized as the iterable is consumed, in chunks of
+    ``_STREAM_CHUNK_ITEMS``, so neither the response model nor the full list is
+    held. The output matches ``RecommendationResponse.to_json()`` except that
+    total_count and the remaining envelope fields (defaults overridable through
+    ``envelope``) come after the list. Route handlers should wrap it in
+    ``StreamingResponse(..., media_type="application/json")``.
+    """
+    unknown = envelope.keys() - RecommendationResponse.model_fields.keys()
+    if unknown or envelope.keys() & set(_STREAMED_FIELDS):
+        raise TypeError(f"Unexpected envelope fields: {sorted(envelope)}")
+
+    dump = Recommendation._adapter().dump_json
+    yield (
+        b'{"user_id":' + to_json(user_id)
+        + b',"festival_id":' + to_json(festival_id)
+        + b',"recommendations":['
+    )
+
+    count = 0
+    chunk: list[bytes] = []
+    for rec in recommendations:
+        chunk.append(dump(rec, exclude_none=True))
+        count += 1
+        if len(chunk) == _STREAM_CHUNK_ITEMS:
+            yield (b"," if count > len(chunk) else b"") + b",".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield (b"," if count > len(chunk) else b"") + b",".join(chunk)
+
+    tail: dict[str, Any] = {"total_count": count}
+    for name, info in RecommendationResponse.model_fields.items():
+        if name not in _STREAMED_FIELDS:
+            tail[name] = envelope.get(name, info.get_default(call_default_factory=True))
+    # Drop the leading "{" of the tail object to continue the open document
+    yield b"]," + to_json({k: v for k, v in tail.items() if v is not None})[1:]
+
+
 class TrendingRequest(BaseModel):
     """Request for trending artists."""
 
@@ -246,22 +883,25 @@ class TrendingRequest(BaseModel):
     time_window_hours: int = Field(default=24, ge=1, le=168)
     genre_filter: Optional[list[str]] = None
 
+    model_config = ConfigDict(defer_build=False)
+
 
-class TrendingArtist(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class TrendingArtist(_ValueType):
     """A trending artist with trend metrics."""
 
-    artist_id: str
+    artist_id: InternedId
     name: str
-    genres: list[str] = Field(default_factory=list)
+    genres: tuple[str, ...] = ()
     image_url: Optional[str] = None
-    trend_score: float = Field(ge=0.0, le=1.0)
-    interaction_count: int = Field(default=0, ge=0)
+    trend_score: Annotated[float, Field(ge=0.0, le=1.0)]
+    interaction_count: Annotated[int, Field(ge=0)] = 0
     change_percent: float = 0.0  # Change vs previous period
-    rank: int = Field(default=0, ge=0)
+    rank: Annotated[int, Field(ge=0)] = 0
     performance: Optional[ArtistPerformance] = None
 
 
-class TrendingResponse(BaseModel):
+class TrendingResponse(_ResponseModel):
     """Response containing trending artists."""
 
     festival_id: str
@@ -278,7 +918,7 @@ class TrendingResponse(BaseModel):
 class ModelConfig(BaseModel):
     """Configuration for recommendation models."""
 
-    model_type: ModelType
+    model_type: ModelTypeValue
     embedding_dim: int = Field(default=64, ge=8, le=512)
     num_factors: int = Field(default=64, ge=8, le=256)
     regularization: float = Field(default=0.01, ge=0.0, le=1.0)
@@ -288,13 +928,15 @@ class ModelConfig(BaseModel):
     use_gpu: bool = False
     random_seed: int = Field(default=42)
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class ABTestConfig(BaseModel):
     """Configuration for A/B testing recommendation models."""
 
     test_name: str
-    model_a: ModelType
-    model_b: ModelType
+    model_a: ModelTypeValue
+    model_b: ModelTypeValue
     traffic_split: float = Field(default=0.5, ge=0.0, le=1.0)  # % to model_a
     start_date: datetime
     end_date: Optional[datetime] = None
@@ -303,6 +945,8 @@ class ABTestConfig(BaseModel):
         default_factory=lambda: ["click_rate", "conversion_rate", "engagement"]
     )
 
+    model_config = ConfigDict(defer_build=True)
+
 
 # =============================================================================
 # SPOTIFY / LASTFM INTEGRATION TYPES
@@ -322,6 +966,8 @@ class SpotifyArtistData(BaseModel):
     top_tracks: list[str] = Field(default_factory=list)
     related_artists: list[str] = Field(default_factory=list)
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class SpotifyAudioFeatures(BaseModel):
     """Audio features for tracks from Spotify."""
@@ -338,6 +984,8 @@ class SpotifyAudioFeatures(BaseModel):
     tempo: float = Field(ge=0.0)
     time_signature: int = Field(default=4, ge=1, le=7)
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class LastFmArtistData(BaseModel):
     """Data fetched from Last.fm API for an artist."""
@@ -350,6 +998,8 @@ class LastFmArtistData(BaseModel):
     similar_artists: list[str] = Field(default_factory=list)
     bio_summary: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class UserListeningHistory(BaseModel):
     """User's listening history from external services."""
@@ -362,6 +1012,8 @@ class UserListeningHistory(BaseModel):
     total_listens: int = Field(default=0, ge=0)
     fetched_at: datetime = Field(default_factory=datetime.utcnow)
 
+    model_config = ConfigDict(defer_build=True)
+
 
 # =============================================================================
 # METRICS AND EVALUATION
@@ -380,11 +1032,13 @@ class RecommendationMetrics(BaseModel):
     novelty: float = 0.0  # How novel recommendations are
     serendipity: float = 0.0  # Unexpected good recommendations
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class ModelEvaluation(BaseModel):
     """Evaluation results for a recommendation model."""
 
-    model_type: ModelType
+    model_type: ModelTypeValue
     model_version: str
     evaluated_at: datetime = Field(default_factory=datetime.utcnow)
     metrics: RecommendationMetrics
@@ -392,3 +1046,5 @@ class ModelEvaluation(BaseModel):
     num_interactions: int = 0
     training_time_seconds: float = 0.0
     inference_time_ms: float = 0.0
+
+    model_config = ConfigDict(defer_build=True)